@@ -0,0 +1,47 @@
+"""Control plane entry point: ``python -m cp --role api|worker|both``."""
+
+import argparse
+import os
+
+ROLES = ("api", "worker", "both")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m cp",
+        epilog="With --role worker, other options such as --concurrency and "
+        "--batch-size are passed on to python -m cp.workers.",
+    )
+    parser.add_argument(
+        "--role",
+        choices=ROLES,
+        default=os.getenv("CP_ROLE", "both"),
+        help="serve the API, run the MQ worker, or both in one process",
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args, worker_argv = parser.parse_known_args(argv)
+    if worker_argv and args.role != "worker":
+        parser.error(f"unrecognized arguments: {' '.join(worker_argv)}")
+    args.worker_argv = worker_argv
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+
+    if args.role == "worker":
+        from .workers.__main__ import main as worker_main
+
+        worker_main(args.worker_argv)
+        return
+
+    import uvicorn
+
+    # read by the app lifespan to decide whether to start the MQ consumer
+    os.environ["CP_ROLE"] = args.role
+    uvicorn.run("cp.main:app", host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from ..auth import get_access_scope, get_audit_actor, require_readonly, require_user
 from ..infra import (
@@ -32,6 +34,7 @@ from ..models import (
     CreateClusterDatabaseObjectRequest,
     DashboardSnapshot,
     ErrorResponse,
+    FleetMetrics,
     JobID,
     NewDatabaseUserRequest,
 )
@@ -39,7 +42,11 @@ from ..services.cluster import ClusterService
 from ..services.cluster_backups import ClusterBackupsService
 from ..services.cluster_jobs import ClusterJobsService
 from ..services.cluster_users import ClusterUsersService
-from ..services.dashboard import DashboardService
+from ..services.dashboard import (
+    DASHBOARD_MAX_POINTS,
+    FLEET_MAX_POINTS,
+    DashboardService,
+)
 from ..services.errors import (
     ServiceAuthorizationError,
     ServiceError,
@@ -83,7 +90,7 @@ async def list_clusters(
 ) -> list[ClusterOverview]:
     groups, is_admin = get_access_scope(claims)
     try:
-        return service.list_visible_clusters(groups, is_admin)
+        return await service.list_visible_clusters_async(groups, is_admin)
     except ServiceError as err:
         _raise_http_from_service_error(err)
 
@@ -95,7 +102,7 @@ async def get_cluster_stats(
 ) -> ClusterStatsResponse:
     groups, is_admin = get_access_scope(claims)
     try:
-        return service.get_visible_cluster_stats(groups, is_admin)
+        return await service.get_visible_cluster_stats_async(groups, is_admin)
     except ServiceError as err:
         _raise_http_from_service_error(err)
 
@@ -111,6 +118,29 @@ async def get_cluster_create_options(
         _raise_http_from_service_error(err)
 
 
+@router.get("/metrics", response_model=FleetMetrics)
+def get_fleet_metrics(
+    start: int = 0,
+    end: int = 0,
+    interval_secs: int = 60,
+    max_points: int = Query(default=FLEET_MAX_POINTS, ge=10, le=1000),
+    claims: dict = Depends(require_readonly),
+    service: DashboardService = Depends(get_dashboard_service),
+) -> FleetMetrics:
+    groups, is_admin = get_access_scope(claims)
+    try:
+        return service.load_fleet_metrics(
+            groups,
+            is_admin,
+            start,
+            end,
+            interval_secs,
+            max_points=max_points,
+        )
+    except ServiceError as err:
+        _raise_http_from_service_error(err)
+
+
 @router.post("/", response_model=JobID)
 async def create_cluster(
     request: ClusterCreateApiRequest,
@@ -145,7 +175,7 @@ async def get_cluster(
 ) -> ClusterPublic:
     groups, is_admin = get_access_scope(claims)
     try:
-        cluster = service.get_cluster_for_user(cluster_id, groups, is_admin)
+        cluster = await service.get_cluster_for_user_async(cluster_id, groups, is_admin)
     except ServiceError as err:
         _raise_http_from_service_error(err)
     if cluster is None:
@@ -649,11 +679,14 @@ async def update_cluster_user_password(
     response_model=DashboardSnapshot,
     responses={404: {"model": ErrorResponse, "description": "Cluster not found."}},
 )
-async def get_cluster_dashboard(
+def get_cluster_dashboard(
     cluster_id: str,
     start: int = 0,
     end: int = 0,
     interval_secs: int = 10,
+    chart_format: Literal["rows", "columns"] = "rows",
+    max_points: int = Query(default=DASHBOARD_MAX_POINTS, ge=10, le=5000),
+    downsample: Literal["lttb", "minmax"] | None = None,
     claims: dict = Depends(require_readonly),
     service: DashboardService = Depends(get_dashboard_service),
 ) -> DashboardSnapshot:
@@ -666,6 +699,9 @@ async def get_cluster_dashboard(
             start,
             end,
             interval_secs,
+            columnar=chart_format == "columns",
+            max_points=max_points,
+            downsample=downsample,
         )
     except ServiceError as err:
         _raise_http_from_service_error(err)
@@ -54,7 +54,7 @@ async def list_events(
 ) -> list[LogMsg]:
     groups, is_admin = get_access_scope(claims)
     try:
-        return service.list_visible_events(limit, offset, groups, is_admin)
+        return await service.list_visible_events_async(limit, offset, groups, is_admin)
     except ServiceError as err:
         _raise_http_from_service_error(err)
 
@@ -64,7 +64,7 @@ async def get_event_count(
     service: EventsService = Depends(get_events_service),
 ) -> EventCountResponse:
     try:
-        total = service.get_event_total()
+        total = await service.get_event_total_async()
     except ServiceError as err:
         _raise_http_from_service_error(err)
 
@@ -58,7 +58,7 @@ async def list_jobs(
 ) -> list[Job]:
     groups, is_admin = get_access_scope(claims)
     try:
-        return service.list_visible_jobs(groups, is_admin)
+        return await service.list_visible_jobs_async(groups, is_admin)
     except ServiceError as err:
         _raise_http_from_service_error(err)
 
@@ -70,7 +70,7 @@ async def get_job_stats(
 ) -> JobStatsResponse:
     groups, is_admin = get_access_scope(claims)
     try:
-        return service.get_visible_job_stats(groups, is_admin)
+        return await service.get_visible_job_stats_async(groups, is_admin)
     except ServiceError as err:
         _raise_http_from_service_error(err)
 
@@ -91,7 +91,7 @@ async def get_job(
 ) -> Job:
     groups, is_admin = get_access_scope(claims)
     try:
-        job = service.get_job_for_user(job_id, groups, is_admin)
+        job = await service.get_job_for_user_async(job_id, groups, is_admin)
     except ServiceError as err:
         _raise_http_from_service_error(err)
 
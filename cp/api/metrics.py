@@ -0,0 +1,26 @@
+from typing import Any
+
+from fastapi import APIRouter, Security
+
+from ..auth import require_admin
+from ..infra import get_pool_stats
+from ..infra.db import get_retry_counts
+from ..infra.db_async import get_async_pool_stats
+from ..workers.remote.common import remote_workers
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    dependencies=[Security(require_admin)],
+)
+
+
+@router.get("/")
+def get_metrics() -> dict[str, Any]:
+    """Process-local connection pool, DB retry and playbook worker statistics."""
+    return {
+        "db_pools": get_pool_stats(),
+        "db_async_pool": get_async_pool_stats(),
+        "db_retries": get_retry_counts(),
+        "remote_workers": remote_workers.stats(),
+    }
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from hashlib import sha256
+from hmac import HMAC
 from hmac import new as hmac_new
 from typing import Any
 
@@ -83,29 +84,20 @@ def request_target_bytes(request: Request) -> bytes:
     return path
 
 
-def build_api_key_signature_payload(
-    request: Request, timestamp: str, body: bytes
-) -> bytes:
-    """Build the canonical payload used for HMAC request signing."""
-    return b"\n".join(
-        [
-            request.method.upper().encode("utf-8"),
-            request_target_bytes(request),
-            timestamp.strip().encode("utf-8"),
-            body,
-        ]
-    )
+def api_key_signer(secret_key: bytes, request: Request, timestamp: str) -> HMAC:
+    """Return an HMAC-SHA256 primed with the signed request head.
 
-
-def api_key_signature(
-    secret_key: bytes, request: Request, timestamp: str, body: bytes
-) -> str:
-    """Return the expected HMAC signature for an API-key-authenticated request."""
-    return hmac_new(
-        secret_key,
-        build_api_key_signature_payload(request, timestamp, body),
-        sha256,
-    ).hexdigest()
+    The canonical payload is ``METHOD\\nTARGET\\nTIMESTAMP\\nBODY``; callers feed
+    the body into the returned object as it arrives.
+    """
+    signer = hmac_new(secret_key, digestmod=sha256)
+    signer.update(request.method.upper().encode("utf-8"))
+    signer.update(b"\n")
+    signer.update(request_target_bytes(request))
+    signer.update(b"\n")
+    signer.update(timestamp.strip().encode("utf-8"))
+    signer.update(b"\n")
+    return signer
 
 
 @dataclass(frozen=True)
@@ -134,11 +126,18 @@ class OIDCConfig:
     groups_claim_name: str = "groups"
     cache_ttl_seconds: int = 300
     api_key_signature_ttl_seconds: int = 300
+    api_key_replay_shared: bool = False
 
     @classmethod
     def from_repo(cls, repo: Repo) -> "OIDCConfig":
         settings = {setting.key: setting for setting in repo.list_settings()}
         enabled = as_bool(settings[SettingKey.oidc_enabled].value, default=False)
+        # optional so deployments seeded before the setting existed keep working
+        replay_shared_setting = settings.get(SettingKey.auth_api_key_replay_shared)
+        api_key_replay_shared = as_bool(
+            replay_shared_setting.value if replay_shared_setting else None,
+            default=False,
+        )
         if not enabled:
             return cls(
                 enabled=False,
@@ -148,6 +147,7 @@ class OIDCConfig:
                 api_key_signature_ttl_seconds=int(
                     settings[SettingKey.auth_api_key_signature_ttl_seconds].value
                 ),
+                api_key_replay_shared=api_key_replay_shared,
             )
 
         return cls(
@@ -185,6 +185,7 @@ class OIDCConfig:
             api_key_signature_ttl_seconds=int(
                 settings[SettingKey.auth_api_key_signature_ttl_seconds].value
             ),
+            api_key_replay_shared=api_key_replay_shared,
         )
 
     @property
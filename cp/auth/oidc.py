@@ -1,7 +1,12 @@
+import asyncio
 import json
+import logging
+import os
+import threading
 import time
 import urllib.parse
 import urllib.request
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from hmac import compare_digest
 from typing import Any
@@ -9,17 +14,50 @@ from typing import Any
 import jwt
 from fastapi import HTTPException, Request, status
 
-from ..infra import decrypt_secret, encrypt_secret, validate_secret_crypto_config
+from ..infra import (
+    TTLCache,
+    decrypt_api_key_secret,
+    decrypt_secret,
+    encrypt_secret,
+    validate_secret_crypto_config,
+)
 from ..models import CPRole, OIDCSessionRecord
 from ..repos import Repo
 from .common import (
     OIDC_SESSION_COOKIE_NAME,
     OIDCConfig,
-    api_key_signature,
+    api_key_signer,
     claims_groups,
     jsonable_role_groups,
     parse_api_key_timestamp,
 )
+from .replay import ReplayGuard, replay_nonce
+
+logger = logging.getLogger(__name__)
+
+OIDC_HTTP_TIMEOUT_SECONDS = 10
+# Provider metadata and JWKS are renewed once this share of the cache TTL has
+# passed, so requests never wait for an expired copy.
+OIDC_REFRESH_AHEAD_RATIO = 0.8
+OIDC_REFRESH_POLL_SECONDS = 15
+# Lower bound between JWKS fetches triggered by tokens with an unknown kid.
+OIDC_JWKS_MIN_REFETCH_SECONDS = 30
+
+# Verified session claims are kept per process for at most this long, and
+# never past the token refresh deadline or the session expiry.
+OIDC_SESSION_CACHE_SIZE = int(os.getenv("OIDC_SESSION_CACHE_SIZE", "10000"))
+OIDC_SESSION_CACHE_MAX_TTL_SECONDS = 300
+# How often a cached session is checked against oidc_sessions, so a logout on
+# another replica revokes it here as well.
+OIDC_SESSION_REVALIDATE_SECONDS = float(
+    os.getenv("OIDC_SESSION_REVALIDATE_SECONDS", "30")
+)
+
+
+@dataclass
+class CachedSession:
+    claims: dict[str, Any]
+    revalidate_at: float
 
 
 class OIDCManager:
@@ -34,6 +72,16 @@ class OIDCManager:
         self._meta_loaded_at = 0.0
         self._jwks_loaded_at = 0.0
         self._cache_ttl_seconds = self.config.cache_ttl_seconds
+        self._refresh_lock = threading.RLock()
+        self._refresh_state_lock = threading.Lock()
+        self._refresh_scheduled = False
+        self._refresher: threading.Thread | None = None
+        self._refresher_stop = threading.Event()
+        self._replay_guard = ReplayGuard()
+        self._session_cache = TTLCache(
+            max_entries=OIDC_SESSION_CACHE_SIZE,
+            ttl=OIDC_SESSION_CACHE_MAX_TTL_SECONDS,
+        )
 
     @property
     def enabled(self) -> bool:
@@ -51,6 +99,7 @@ class OIDCManager:
 
         new_config = OIDCConfig.from_repo(repo)
         if self.config != new_config:
+            self._session_cache.clear()
             self._metadata = None
             self._jwks = None
             self._meta_loaded_at = 0.0
@@ -88,7 +137,9 @@ class OIDCManager:
             headers=req_headers,
             method=method,
         )
-        with urllib.request.urlopen(req, timeout=10) as resp:  # nosec B310
+        with urllib.request.urlopen(  # nosec B310
+            req, timeout=OIDC_HTTP_TIMEOUT_SECONDS
+        ) as resp:
             raw = resp.read().decode("utf-8")
             parsed = json.loads(raw)
             if not isinstance(parsed, dict):
@@ -96,25 +147,42 @@ class OIDCManager:
             return parsed
 
     def get_metadata(self) -> dict[str, Any]:
-        """Return cached OIDC discovery metadata, refreshing it when the cache expires."""
-        if (
-            self._metadata
-            and (time.time() - self._meta_loaded_at) < self._cache_ttl_seconds
-        ):
-            return self._metadata
+        """Return cached OIDC discovery metadata.
+
+        Only the first call blocks on the provider. Afterwards the background
+        refresher renews the document ahead of expiry, and an expired copy is
+        served while a refresh is in flight.
+        """
+        metadata = self._metadata
+        if metadata is None:
+            with self._refresh_lock:
+                if self._metadata is None:
+                    self._load_metadata()
+                return self._metadata
+
+        if (time.time() - self._meta_loaded_at) >= self._cache_ttl_seconds:
+            self._refresh_in_background()
+        return metadata
+
+    def get_jwks(self) -> dict[str, Any]:
+        """Return cached provider signing keys, with the same refresh policy as metadata."""
+        jwks = self._jwks
+        if jwks is None:
+            with self._refresh_lock:
+                if self._jwks is None:
+                    self._load_jwks()
+                return self._jwks
+
+        if (time.time() - self._jwks_loaded_at) >= self._cache_ttl_seconds:
+            self._refresh_in_background()
+        return jwks
+
+    def _load_metadata(self) -> None:
         metadata_url = f"{self.config.issuer_url}/.well-known/openid-configuration"
         self._metadata = self._http_json(metadata_url)
         self._meta_loaded_at = time.time()
-        return self._metadata
-
-    def get_jwks(self) -> dict[str, Any]:
-        """Return cached provider signing keys, refreshing them when needed."""
-        if (
-            self._jwks
-            and (time.time() - self._jwks_loaded_at) < self._cache_ttl_seconds
-        ):
-            return self._jwks
 
+    def _load_jwks(self) -> None:
         metadata = self.get_metadata()
         jwks_uri = str(metadata.get("jwks_uri") or "")
         if not jwks_uri:
@@ -122,7 +190,82 @@ class OIDCManager:
 
         self._jwks = self._http_json(jwks_uri)
         self._jwks_loaded_at = time.time()
-        return self._jwks
+
+    def refresh_provider_documents(self) -> None:
+        """Renew metadata and JWKS that are close to expiry; keep stale copies on error."""
+        if not self.enabled:
+            return
+
+        refresh_after = self._cache_ttl_seconds * OIDC_REFRESH_AHEAD_RATIO
+        with self._refresh_lock:
+            now = time.time()
+            try:
+                if (
+                    self._metadata is None
+                    or now - self._meta_loaded_at >= refresh_after
+                ):
+                    self._load_metadata()
+                if self._jwks is None or now - self._jwks_loaded_at >= refresh_after:
+                    self._load_jwks()
+            except Exception:
+                logger.warning(
+                    "Unable to refresh OIDC provider documents", exc_info=True
+                )
+
+    def _refresh_in_background(self) -> None:
+        with self._refresh_state_lock:
+            if self._refresh_scheduled:
+                return
+            self._refresh_scheduled = True
+        threading.Thread(
+            target=self._refresh_once,
+            name="oidc-refresh",
+            daemon=True,
+        ).start()
+
+    def _refresh_once(self) -> None:
+        try:
+            self.refresh_provider_documents()
+        finally:
+            with self._refresh_state_lock:
+                self._refresh_scheduled = False
+
+    def _refetch_jwks(self) -> dict[str, Any]:
+        """Fetch JWKS now for a token signed with an unknown key.
+
+        Concurrent callers share one fetch, and the provider is asked at most
+        once every ``OIDC_JWKS_MIN_REFETCH_SECONDS``.
+        """
+        with self._refresh_lock:
+            if (time.time() - self._jwks_loaded_at) >= OIDC_JWKS_MIN_REFETCH_SECONDS:
+                try:
+                    self._load_jwks()
+                except Exception:
+                    logger.warning("Unable to refetch OIDC JWKS", exc_info=True)
+            return self._jwks or {}
+
+    def start_refresher(self) -> None:
+        """Start the background thread that renews metadata and JWKS before expiry."""
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._refresher_stop.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop,
+            name="oidc-refresher",
+            daemon=True,
+        )
+        self._refresher.start()
+
+    def stop_refresher(self) -> None:
+        self._refresher_stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=OIDC_HTTP_TIMEOUT_SECONDS)
+        self._refresher = None
+
+    def _refresh_loop(self) -> None:
+        self.refresh_provider_documents()
+        while not self._refresher_stop.wait(OIDC_REFRESH_POLL_SECONDS):
+            self.refresh_provider_documents()
 
     def build_authorization_url(self, redirect_uri: str, state: str, nonce: str) -> str:
         """Build the provider authorization URL for starting the OIDC login flow."""
@@ -202,8 +345,8 @@ class OIDCManager:
             if jwk.get("kid") == kid:
                 return jwt.PyJWK.from_dict(jwk).key
 
-        self._jwks = None
-        keys = self.get_jwks().get("keys", [])
+        # the provider may have rotated its signing keys
+        keys = self._refetch_jwks().get("keys", [])
         for jwk in keys:
             if jwk.get("kid") == kid:
                 return jwt.PyJWK.from_dict(jwk).key
@@ -376,7 +519,7 @@ class OIDCManager:
         timestamp: str,
     ) -> dict[str, Any]:
         """Authenticate an API request using the HMAC-signed API key headers."""
-        api_key = repo.get_api_key(access_key)
+        api_key = await repo.get_cached_api_key_async(access_key)
         if api_key is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -405,16 +548,46 @@ class OIDCManager:
                 detail="API request timestamp is expired.",
             )
 
-        body = await request.body()
-        secret_key = decrypt_secret(api_key.encrypted_secret_access_key)
-        expected_signature = api_key_signature(secret_key, request, timestamp, body)
-
-        if not compare_digest(expected_signature, signature.strip().lower()):
+        secret_key = decrypt_api_key_secret(api_key.encrypted_secret_access_key)
+        signer = api_key_signer(secret_key, request, timestamp)
+        chunks: list[bytes] = []
+        async for chunk in request.stream():
+            if chunk:
+                signer.update(chunk)
+                chunks.append(chunk)
+        # hand the body to the route the way Request.body() would have cached it
+        request._body = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+        if not compare_digest(signer.hexdigest(), signature.strip().lower()):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid API key signature.",
             )
 
+        nonce = replay_nonce(api_key.access_key, signature)
+        if self.config.api_key_replay_shared:
+            # remember the request locally only once the shared claim went
+            # through, so a client retrying after a transient DB error is
+            # not turned away as a replay
+            is_first_use = not self._replay_guard.seen(nonce, signed_at.timestamp())
+            if is_first_use:
+                is_first_use = await repo.claim_api_key_nonce_async(
+                    nonce, signed_at + timedelta(seconds=max_age_seconds)
+                )
+            if is_first_use:
+                self._replay_guard.check_and_remember(
+                    nonce, signed_at.timestamp(), max_age_seconds
+                )
+        else:
+            is_first_use = self._replay_guard.check_and_remember(
+                nonce, signed_at.timestamp(), max_age_seconds
+            )
+        if not is_first_use:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="API request was already used.",
+            )
+
         roles = set(api_key.roles or [])
         role_groups = {role: {role.value} for role in roles}
         return {
@@ -455,7 +628,7 @@ class OIDCManager:
             return {"sub": "anonymous", "auth_disabled": True}
 
         if session_token:
-            return self._claims_from_session(repo, session_token)
+            return await self._claims_from_session(repo, session_token)
 
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -463,13 +636,25 @@ class OIDCManager:
             headers={"X-Auth-Login-Url": self.config.login_path},
         )
 
-    def _claims_from_session(
+    async def _claims_from_session(
         self,
         repo: Repo,
         session_id: str,
     ) -> dict[str, Any]:
         """Load a server-side OIDC session, refreshing token material when needed."""
-        session = repo.get_oidc_session(session_id)
+        cached: CachedSession | None = self._session_cache.get(session_id)
+        if cached is not None:
+            if time.monotonic() < cached.revalidate_at:
+                return dict(cached.claims)
+            if await repo.oidc_session_exists_async(session_id):
+                cached.revalidate_at = (
+                    time.monotonic() + OIDC_SESSION_REVALIDATE_SECONDS
+                )
+                return dict(cached.claims)
+            self.invalidate_session(session_id)
+            raise self._not_authenticated()
+
+        session = await repo.get_oidc_session_async(session_id)
         if session is None:
             raise self._not_authenticated()
 
@@ -478,22 +663,68 @@ class OIDCManager:
             repo.delete_oidc_session(session_id)
             raise self._not_authenticated("OIDC session expired.")
 
+        # validation may wait for a JWKS fetch or refresh tokens at the
+        # provider, so keep it off the event loop
+        claims = await asyncio.to_thread(self._verify_session, repo, session, now)
+        claims = self.ensure_authorized(claims)
+        claims["_session_id"] = session_id
+        claims["auth_type"] = "oidc"
+        self._cache_session(session, claims)
+        return dict(claims)
+
+    def _verify_session(
+        self,
+        repo: Repo,
+        session: OIDCSessionRecord,
+        now: datetime,
+    ) -> dict[str, Any]:
+        """Validate the stored ID token, refreshing the session when it is due or invalid."""
         refresh_deadline = session.token_expires_at - timedelta(
             seconds=self.config.refresh_leeway_seconds
         )
         if refresh_deadline <= now:
-            claims = self._refresh_session(repo, session)
-        else:
-            try:
-                id_token = decrypt_secret(session.encrypted_id_token).decode("utf-8")
-                claims = self.validate_jwt(id_token, strict_client_audience=True)
-            except Exception:
-                claims = self._refresh_session(repo, session)
+            return self._refresh_session(repo, session)
+        try:
+            id_token = decrypt_secret(session.encrypted_id_token).decode("utf-8")
+            return self.validate_jwt(id_token, strict_client_audience=True)
+        except Exception:
+            return self._refresh_session(repo, session)
 
-        claims = self.ensure_authorized(claims)
-        claims["_session_id"] = session_id
-        claims["auth_type"] = "oidc"
-        return claims
+    def _cache_session(
+        self,
+        session: OIDCSessionRecord,
+        claims: dict[str, Any],
+    ) -> None:
+        """Cache verified claims until the token needs refreshing or the session ends."""
+        try:
+            token_expires_at = self.token_expires_at(claims)
+        except HTTPException:
+            return
+
+        now = datetime.now(timezone.utc)
+        valid_until = min(
+            token_expires_at - timedelta(seconds=self.config.refresh_leeway_seconds),
+            session.session_expires_at,
+        )
+        ttl = min(
+            (valid_until - now).total_seconds(),
+            OIDC_SESSION_CACHE_MAX_TTL_SECONDS,
+        )
+        if ttl <= 0:
+            return
+
+        self._session_cache.set(
+            session.session_id,
+            CachedSession(
+                claims=claims,
+                revalidate_at=time.monotonic() + OIDC_SESSION_REVALIDATE_SECONDS,
+            ),
+            ttl=ttl,
+        )
+
+    def invalidate_session(self, session_id: str) -> None:
+        """Drop cached claims for a session that was logged out or refreshed."""
+        self._session_cache.invalidate(session_id)
 
     def _refresh_session(
         self,
@@ -501,6 +732,7 @@ class OIDCManager:
         session: OIDCSessionRecord,
     ) -> dict[str, Any]:
         """Refresh an OIDC session using its stored refresh token."""
+        self.invalidate_session(session.session_id)
         if not session.encrypted_refresh_token:
             repo.delete_oidc_session(session.session_id)
             raise self._not_authenticated("OIDC session expired.")
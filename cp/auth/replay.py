@@ -0,0 +1,74 @@
+import threading
+import time
+from hashlib import blake2b
+
+# Width of one replay bucket. Expiry drops whole buckets, so a signature is
+# remembered for at most one bucket longer than the accepted window.
+REPLAY_BUCKET_SECONDS = 10
+
+
+def replay_nonce(access_key: str, signature: str) -> bytes:
+    """Return a compact fingerprint identifying one signed API request."""
+    return blake2b(
+        f"{access_key}:{signature.strip().lower()}".encode("utf-8"),
+        digest_size=16,
+    ).digest()
+
+
+class ReplayGuard:
+    """Remember signed API requests until their timestamps leave the accepted window.
+
+    Fingerprints are filed into buckets by the request's signed-at time, so a
+    replay check touches a single set and expiry discards whole buckets.
+    """
+
+    def __init__(self, bucket_seconds: int = REPLAY_BUCKET_SECONDS) -> None:
+        self.bucket_seconds = bucket_seconds
+        self._buckets: dict[int, set[bytes]] = {}
+        self._floor: int | None = None
+        self._lock = threading.Lock()
+
+    def check_and_remember(
+        self,
+        nonce: bytes,
+        signed_at: float,
+        window_seconds: float,
+        now: float | None = None,
+    ) -> bool:
+        """Return ``True`` the first time ``nonce`` is seen and ``False`` for a replay."""
+        now = time.time() if now is None else now
+        bucket = int(signed_at // self.bucket_seconds)
+        oldest_bucket = int((now - window_seconds) // self.bucket_seconds)
+        if bucket < oldest_bucket:
+            # already outside the window; the timestamp check rejects it
+            return True
+        with self._lock:
+            self._expire(oldest_bucket)
+            seen = self._buckets.setdefault(bucket, set())
+            if nonce in seen:
+                return False
+            seen.add(nonce)
+            return True
+
+    def seen(self, nonce: bytes, signed_at: float) -> bool:
+        """Return whether ``nonce`` was already remembered, without recording it."""
+        bucket = int(signed_at // self.bucket_seconds)
+        with self._lock:
+            return nonce in self._buckets.get(bucket, ())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(seen) for seen in self._buckets.values())
+
+    def _expire(self, oldest_bucket: int) -> None:
+        # buckets before ``oldest_bucket`` only hold timestamps that are
+        # already outside the accepted window
+        if self._floor is not None and oldest_bucket <= self._floor:
+            return
+        if self._floor is None or oldest_bucket - self._floor > len(self._buckets):
+            stale = [bucket for bucket in self._buckets if bucket < oldest_bucket]
+        else:
+            stale = range(self._floor, oldest_bucket)
+        for bucket in stale:
+            self._buckets.pop(bucket, None)
+        self._floor = oldest_bucket
@@ -176,6 +176,7 @@ def oidc_logout(
     session_id = str(claims.get("_session_id") or "").strip()
     if session_id:
         repo.delete_oidc_session(session_id)
+        oidc.invalidate_session(session_id)
     log_auth_event(
         repo,
         actor_id,
@@ -1,6 +1,14 @@
 """Shared infrastructure entrypoints for DB lifecycle and FastAPI dependencies."""
 
-from .db import close_db, get_pool, get_repo, initialize_postgres
+from .cache import TTLCache
+from .db import (
+    close_db,
+    get_pool,
+    get_pool_stats,
+    get_repo,
+    initialize_postgres,
+    use_worker_pool,
+)
 from .dependencies import (
     get_admin_service,
     get_alerts_service,
@@ -40,8 +48,10 @@ from .util import (
 __all__ = [
     "close_db",
     "get_pool",
+    "get_pool_stats",
     "get_repo",
     "initialize_postgres",
+    "use_worker_pool",
     "get_admin_service",
     "get_alerts_service",
     "get_auth_service",
@@ -62,6 +72,7 @@ __all__ = [
     "get_api_keys_service",
     "RequestIDFilter",
     "ShorthandFormatter",
+    "TTLCache",
     "as_bool",
     "connect_cluster_db",
     "decrypt_secret",
@@ -0,0 +1,94 @@
+"""In-process caching primitives."""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ``ttl`` seconds after insertion.
+
+    ``get_or_load`` is single-flight: concurrent misses on the same key wait
+    for one loader call instead of each running their own.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._loading: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._get_locked(key, default)
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        with self._lock:
+            self._set_locked(key, value, ttl)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: float | None = None,
+    ) -> Any:
+        missing = object()
+        with self._lock:
+            value = self._get_locked(key, missing)
+            if value is not missing:
+                return value
+            future = self._loading.get(key)
+            is_loader = future is None
+            if is_loader:
+                future = Future()
+                self._loading[key] = future
+
+        if not is_loader:
+            return future.result()
+
+        try:
+            value = loader()
+        except BaseException as err:
+            with self._lock:
+                self._loading.pop(key, None)
+            future.set_exception(err)
+            raise
+
+        with self._lock:
+            self._loading.pop(key, None)
+            self._set_locked(key, value, ttl)
+        future.set_result(value)
+        return value
+
+    def _get_locked(self, key: Hashable, default: Any) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_locked(self, key: Hashable, value: Any, ttl: float | None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
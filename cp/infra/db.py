@@ -2,16 +2,24 @@
 
 import logging
 import os
-from typing import Any
-
-from psycopg import DatabaseError, InterfaceError, OperationalError
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Callable, Iterator, TypeVar
+
+from psycopg import Connection, DatabaseError, InterfaceError, OperationalError
 from psycopg import errors as psycopg_errors
 from psycopg.abc import Dumper
 from psycopg.pq import Format
 from psycopg.rows import class_row
 from psycopg.types.array import ListDumper
 from psycopg.types.json import Jsonb, JsonbDumper
-from psycopg_pool import ConnectionPool
+from psycopg_pool import ConnectionPool, PoolTimeout
 
 from .errors import (
     RepositoryConflictError,
@@ -20,12 +28,49 @@ from .errors import (
     RepositoryUnavailableError,
     RepositoryValidationError,
 )
-from .util import ClusterDatabaseConnectionError
+from .util import ClusterDatabaseConnectionError, as_bool
 
 DB_URL = os.getenv("DB_URL")
-pool: ConnectionPool | None = None
 logger = logging.getLogger(__name__)
 
+API_POOL = "api"
+WORKER_POOL = "worker"
+
+# Pool sizing and connection lifetimes. The worker pool serves the MQ consumer
+# and playbook threads so queue work cannot starve API requests of connections.
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "4"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "16"))
+DB_WORKER_POOL_MIN_SIZE = int(os.getenv("DB_WORKER_POOL_MIN_SIZE", "2"))
+DB_WORKER_POOL_MAX_SIZE = int(os.getenv("DB_WORKER_POOL_MAX_SIZE", "8"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+DB_POOL_MAX_IDLE_SECONDS = float(os.getenv("DB_POOL_MAX_IDLE_SECONDS", "300"))
+DB_POOL_MAX_LIFETIME_SECONDS = float(os.getenv("DB_POOL_MAX_LIFETIME_SECONDS", "1800"))
+# Pinging every connection on checkout costs a round trip per query; stale
+# connections are recycled through max_idle/max_lifetime and connection
+# errors are retried instead.
+DB_POOL_CHECK = as_bool(os.getenv("DB_POOL_CHECK"), default=False)
+
+pools: dict[str, ConnectionPool] = {}
+# Pool used by repository calls made from the current thread or task.
+_pool_name: ContextVar[str] = ContextVar("db_pool_name", default=API_POOL)
+
+TX_MAX_RETRIES = 5
+# Attempts per statement for serialization failures and, on idempotent
+# statements, dropped connections. Backoff is full-jitter exponential.
+DB_RETRY_ATTEMPTS = int(os.getenv("DB_RETRY_ATTEMPTS", "4"))
+DB_RETRY_BASE_DELAY_SECONDS = 0.025
+DB_RETRY_MAX_DELAY_SECONDS = 1.0
+T = TypeVar("T")
+
+_DML_RE = re.compile(r"\b(INSERT|UPDATE|UPSERT|DELETE)\b")
+
+_retry_counts: Counter[str] = Counter()
+_retry_counts_lock = threading.Lock()
+
+# Connection pinned by an open transaction() block; the statement helpers run
+# on it instead of checking out their own autocommit connection.
+_tx_conn: ContextVar[Connection | None] = ContextVar("db_tx_conn", default=None)
+
 
 class Dict2JsonbDumper(JsonbDumper):
     def dump(self, obj):
@@ -52,16 +97,16 @@ def execute_stmt(
     bind_args: tuple = (),
     *,
     operation: str | None = None,
+    idempotent: bool = False,
 ) -> None:
-    with get_pool().connection() as conn:
-        _register_dumpers(conn)
+    stmt = _normalize_stmt(stmt)
 
-        with conn.cursor() as cur:
-            try:
-                stmt = _normalize_stmt(stmt)
+    def attempt() -> None:
+        with _connection() as conn:
+            with conn.cursor() as cur:
                 cur.execute(stmt, bind_args)
-            except Exception as err:
-                raise translate_database_error(err, operation) from err
+
+    _run_with_retries(attempt, operation, idempotent)
 
 
 def fetch_all(
@@ -70,17 +115,17 @@ def fetch_all(
     row_type,
     *,
     operation: str | None = None,
+    idempotent: bool | None = None,
 ) -> list[Any]:
-    with get_pool().connection() as conn:
-        _register_dumpers(conn)
+    stmt = _normalize_stmt(stmt)
 
-        with conn.cursor(row_factory=class_row(row_type)) as cur:
-            try:
-                stmt = _normalize_stmt(stmt)
+    def attempt() -> list[Any]:
+        with _connection() as conn:
+            with conn.cursor(row_factory=class_row(row_type)) as cur:
                 cur.execute(stmt, bind_args)
                 return cur.fetchall()
-            except Exception as err:
-                raise translate_database_error(err, operation) from err
+
+    return _run_with_retries(attempt, operation, _is_idempotent(stmt, idempotent))
 
 
 def fetch_one(
@@ -89,17 +134,17 @@ def fetch_one(
     row_type,
     *,
     operation: str | None = None,
+    idempotent: bool | None = None,
 ) -> Any | None:
-    with get_pool().connection() as conn:
-        _register_dumpers(conn)
+    stmt = _normalize_stmt(stmt)
 
-        with conn.cursor(row_factory=class_row(row_type)) as cur:
-            try:
-                stmt = _normalize_stmt(stmt)
+    def attempt() -> Any | None:
+        with _connection() as conn:
+            with conn.cursor(row_factory=class_row(row_type)) as cur:
                 cur.execute(stmt, bind_args)
                 return cur.fetchone()
-            except Exception as err:
-                raise translate_database_error(err, operation) from err
+
+    return _run_with_retries(attempt, operation, _is_idempotent(stmt, idempotent))
 
 
 def fetch_scalar(
@@ -107,20 +152,206 @@ def fetch_scalar(
     bind_args: tuple = (),
     *,
     operation: str | None = None,
+    idempotent: bool | None = None,
 ) -> Any | None:
-    with get_pool().connection() as conn:
-        _register_dumpers(conn)
+    stmt = _normalize_stmt(stmt)
 
-        with conn.cursor() as cur:
-            try:
-                stmt = _normalize_stmt(stmt)
+    def attempt() -> Any | None:
+        with _connection() as conn:
+            with conn.cursor() as cur:
                 cur.execute(stmt, bind_args)
                 row = cur.fetchone()
                 if row is None:
                     return None
                 return row[0]
-            except Exception as err:
+
+    return _run_with_retries(attempt, operation, _is_idempotent(stmt, idempotent))
+
+
+def _run_with_retries(
+    attempt: Callable[[], T],
+    operation: str | None,
+    idempotent: bool,
+) -> T:
+    """Run one statement, retrying it on transient errors.
+
+    A serialization failure on an implicit transaction means nothing was
+    committed, so it is always retried. A dropped connection leaves the
+    outcome unknown and is only retried for idempotent statements. Inside
+    ``transaction()`` the statement runs once; retries belong to
+    ``run_transaction``.
+    """
+    in_transaction = _tx_conn.get() is not None
+    for attempt_no in range(1, DB_RETRY_ATTEMPTS + 1):
+        try:
+            return attempt()
+        except Exception as err:
+            if (
+                in_transaction
+                or attempt_no == DB_RETRY_ATTEMPTS
+                or not _should_retry(err, idempotent)
+            ):
+                raise translate_database_error(err, operation) from err
+            _backoff(operation, attempt_no, err)
+
+    raise AssertionError("unreachable")
+
+
+@contextmanager
+def _connection() -> Iterator[Connection]:
+    conn = _tx_conn.get()
+    if conn is not None:
+        yield conn
+        return
+
+    with get_pool().connection() as conn:
+        yield conn
+
+
+@contextmanager
+def transaction() -> Iterator[Connection]:
+    """Run the enclosed repository calls on one connection in one transaction.
+
+    Nested blocks join the outer transaction. The transaction commits when
+    the outermost block exits and rolls back if it raises. The block cannot
+    be replayed, so use ``run_transaction`` for work that should be retried
+    on contention.
+    """
+    conn = _tx_conn.get()
+    if conn is not None:
+        yield conn
+        return
+
+    with get_pool().connection() as conn:
+        token = _tx_conn.set(conn)
+        try:
+            with conn.transaction():
+                yield conn
+        finally:
+            _tx_conn.reset(token)
+
+
+def run_transaction(
+    fn: Callable[[], T],
+    *,
+    operation: str | None = None,
+    idempotent: bool = False,
+    max_retries: int = TX_MAX_RETRIES,
+) -> T:
+    """Run ``fn`` in a transaction using CockroachDB's client-side retry protocol.
+
+    ``fn`` is re-run from the ``cockroach_restart`` savepoint whenever the
+    transaction hits a retryable serialization error, so it must not have
+    side effects outside the database. When ``idempotent`` is set, the whole
+    transaction is also replayed on a fresh connection after a connection
+    error.
+    """
+    if _tx_conn.get() is not None:
+        return fn()
+
+    for attempt_no in range(1, max_retries + 1):
+        try:
+            return _run_transaction_once(fn, operation, max_retries)
+        except Exception as err:
+            if (
+                attempt_no == max_retries
+                or not idempotent
+                or not _is_connection_error(err)
+            ):
+                if isinstance(err, RepositoryError):
+                    raise
                 raise translate_database_error(err, operation) from err
+            _backoff(operation, attempt_no, err)
+
+    raise AssertionError("unreachable")
+
+
+def _run_transaction_once(
+    fn: Callable[[], T],
+    operation: str | None,
+    max_retries: int,
+) -> T:
+    with transaction() as conn:
+        conn.execute("SAVEPOINT cockroach_restart")
+        for attempt_no in range(1, max_retries + 1):
+            try:
+                result = fn()
+                conn.execute("RELEASE SAVEPOINT cockroach_restart")
+                return result
+            except Exception as err:
+                if attempt_no == max_retries or not _is_serialization_failure(err):
+                    raise
+                conn.execute("ROLLBACK TO SAVEPOINT cockroach_restart")
+                _backoff(operation, attempt_no, err)
+
+    raise AssertionError("unreachable")
+
+
+def get_retry_counts() -> dict[str, int]:
+    """Number of retried attempts per repository operation since startup."""
+    with _retry_counts_lock:
+        return dict(_retry_counts)
+
+
+def _backoff(operation: str | None, attempt_no: int, err: Exception) -> None:
+    time.sleep(_retry_delay(operation, attempt_no, err))
+
+
+def _retry_delay(operation: str | None, attempt_no: int, err: Exception) -> float:
+    """Count a retry of ``operation`` and pick its full-jitter backoff delay."""
+    operation_name = operation or "database.statement"
+    with _retry_counts_lock:
+        _retry_counts[operation_name] += 1
+
+    delay = random.uniform(
+        0, min(DB_RETRY_MAX_DELAY_SECONDS, DB_RETRY_BASE_DELAY_SECONDS * 2**attempt_no)
+    )
+    logger.info(
+        "Retrying database operation [operation=%s attempt=%s error=%s delay=%.3f]",
+        operation_name,
+        attempt_no,
+        _root_error(err).__class__.__name__,
+        delay,
+    )
+    return delay
+
+
+def _should_retry(err: Exception, idempotent: bool) -> bool:
+    if _is_serialization_failure(err):
+        return True
+    return idempotent and _is_connection_error(err)
+
+
+def _is_idempotent(stmt: str, idempotent: bool | None) -> bool:
+    if idempotent is not None:
+        return idempotent
+    head = stmt.lstrip().upper()
+    if head.startswith(("SELECT", "SHOW")):
+        return True
+    # a CTE query is read-only unless one of its parts modifies data
+    return head.startswith("WITH") and _DML_RE.search(head) is None
+
+
+def _is_serialization_failure(err: BaseException) -> bool:
+    return getattr(_root_error(err), "sqlstate", None) == "40001"
+
+
+def _is_connection_error(err: BaseException) -> bool:
+    root = _root_error(err)
+    if isinstance(root, PoolTimeout):
+        # the pool is exhausted; retrying would only queue more waiters
+        return False
+    if not isinstance(root, (OperationalError, InterfaceError)):
+        return False
+    sqlstate = getattr(root, "sqlstate", None)
+    return sqlstate is None or sqlstate.startswith("08") or sqlstate == "57P01"
+
+
+def _root_error(err: BaseException) -> BaseException:
+    # repository errors wrap the driver error they were translated from
+    while isinstance(err, RepositoryError) and err.__cause__ is not None:
+        err = err.__cause__
+    return err
 
 
 def _register_dumpers(conn) -> None:
@@ -129,31 +360,86 @@ def _register_dumpers(conn) -> None:
     conn.adapters.register_dumper(list, SelectorDumper)
 
 
+class DynamicStmt(str):
+    """SQL text generated per call, e.g. with a variable-length VALUES list.
+
+    Such statements are normalized on every use instead of being kept in the
+    statement cache, where one-off texts would only crowd out the constants.
+    """
+
+
 def _normalize_stmt(stmt: str) -> str:
-    return " ".join([s.strip() for s in stmt.split("\n")])
+    # adapters are registered by the pool's configure, so normalizing is the
+    # only per-call preparation left
+    if isinstance(stmt, DynamicStmt):
+        return _normalize(stmt)
+    return _normalize_cached(stmt)
 
 
-def initialize_postgres(db_url: str | None = None) -> None:
-    global pool
+@lru_cache(maxsize=1024)
+def _normalize_cached(stmt: str) -> str:
+    # repository SQL is almost always a module constant, so each statement
+    # is normalized once
+    return _normalize(stmt)
 
+
+def _normalize(stmt: str) -> str:
+    return " ".join([s.strip() for s in stmt.split("\n")])
+
+
+def initialize_postgres(
+    db_url: str | None = None,
+    pool_names: tuple[str, ...] = (API_POOL, WORKER_POOL),
+) -> None:
     effective_db_url = db_url or DB_URL
     if not effective_db_url:
         raise EnvironmentError("DB_URL env variable not found!")
 
-    if pool is not None:
-        return
+    for name in pool_names:
+        if name in pools:
+            continue
+        min_size, max_size = _pool_size(name)
+        pools[name] = ConnectionPool(
+            effective_db_url,
+            name=f"cp-{name}",
+            min_size=min_size,
+            max_size=max_size,
+            timeout=DB_POOL_TIMEOUT_SECONDS,
+            max_idle=DB_POOL_MAX_IDLE_SECONDS,
+            max_lifetime=DB_POOL_MAX_LIFETIME_SECONDS,
+            check=ConnectionPool.check_connection if DB_POOL_CHECK else None,
+            kwargs={"autocommit": True},
+            configure=_register_dumpers,
+        )
+
+
+def _pool_size(name: str) -> tuple[int, int]:
+    if name == WORKER_POOL:
+        return DB_WORKER_POOL_MIN_SIZE, max(
+            DB_WORKER_POOL_MIN_SIZE, DB_WORKER_POOL_MAX_SIZE
+        )
+    return DB_POOL_MIN_SIZE, max(DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE)
 
-    pool = ConnectionPool(
-        effective_db_url,
-        kwargs={"autocommit": True},
-        configure=_register_dumpers,
-    )
+
+def use_worker_pool() -> None:
+    """Send repository calls from the current thread or task to the worker pool.
+
+    Meant as a ``ThreadPoolExecutor`` initializer or as the first call of a
+    queue-side thread or coroutine.
+    """
+    _pool_name.set(WORKER_POOL)
 
 
 def get_pool() -> ConnectionPool:
-    if pool is None:
+    if not pools:
         raise RuntimeError("Database pool not initialized. Ensure lifespan ran.")
-    return pool
+    # a process running a single role only opens that role's pool
+    return pools.get(_pool_name.get()) or next(iter(pools.values()))
+
+
+def get_pool_stats() -> dict[str, dict[str, int]]:
+    """``psycopg_pool`` statistics for every open pool, keyed by pool name."""
+    return {name: pool.get_stats() for name, pool in pools.items()}
 
 
 def get_repo():
@@ -163,12 +449,10 @@ def get_repo():
 
 
 def close_db() -> None:
-    global pool
-
-    if pool is not None:
+    for pool in pools.values():
         pool.close()
 
-    pool = None
+    pools.clear()
 
 
 def translate_database_error(
@@ -0,0 +1,180 @@
+"""Async metadata-database helpers for request handlers running on the event loop.
+
+These mirror the statement helpers in ``db.py`` on top of an
+``AsyncConnectionPool`` so hot read paths do not block the event loop. They
+share statement normalization, retry policy and error translation with the
+sync helpers.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, TypeVar
+
+from psycopg import AsyncConnection
+from psycopg.rows import class_row
+from psycopg_pool import AsyncConnectionPool
+
+from .db import (
+    DB_POOL_CHECK,
+    DB_POOL_MAX_IDLE_SECONDS,
+    DB_POOL_MAX_LIFETIME_SECONDS,
+    DB_POOL_MAX_SIZE,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_RETRY_ATTEMPTS,
+    DB_URL,
+    _is_idempotent,
+    _normalize_stmt,
+    _register_dumpers,
+    _retry_delay,
+    _should_retry,
+    translate_database_error,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+async_pool: AsyncConnectionPool | None = None
+
+
+async def initialize_async_postgres(db_url: str | None = None) -> None:
+    global async_pool
+
+    effective_db_url = db_url or DB_URL
+    if not effective_db_url:
+        raise EnvironmentError("DB_URL env variable not found!")
+
+    if async_pool is not None:
+        return
+
+    pool = AsyncConnectionPool(
+        effective_db_url,
+        name="cp-api-async",
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=max(DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE),
+        timeout=DB_POOL_TIMEOUT_SECONDS,
+        max_idle=DB_POOL_MAX_IDLE_SECONDS,
+        max_lifetime=DB_POOL_MAX_LIFETIME_SECONDS,
+        check=AsyncConnectionPool.check_connection if DB_POOL_CHECK else None,
+        kwargs={"autocommit": True},
+        configure=_configure,
+        open=False,
+    )
+    await pool.open()
+    async_pool = pool
+
+
+async def close_async_db() -> None:
+    global async_pool
+
+    if async_pool is not None:
+        await async_pool.close()
+
+    async_pool = None
+
+
+def get_async_pool() -> AsyncConnectionPool:
+    if async_pool is None:
+        raise RuntimeError("Async database pool not initialized. Ensure lifespan ran.")
+    return async_pool
+
+
+def get_async_pool_stats() -> dict[str, int] | None:
+    return async_pool.get_stats() if async_pool is not None else None
+
+
+async def execute_stmt(
+    stmt: str,
+    bind_args: tuple = (),
+    *,
+    operation: str | None = None,
+    idempotent: bool = False,
+) -> None:
+    stmt = _normalize_stmt(stmt)
+
+    async def attempt() -> None:
+        async with get_async_pool().connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(stmt, bind_args)
+
+    await _run_with_retries(attempt, operation, idempotent)
+
+
+async def fetch_all(
+    stmt: str,
+    bind_args: tuple,
+    row_type,
+    *,
+    operation: str | None = None,
+    idempotent: bool | None = None,
+) -> list[Any]:
+    stmt = _normalize_stmt(stmt)
+
+    async def attempt() -> list[Any]:
+        async with get_async_pool().connection() as conn:
+            async with conn.cursor(row_factory=class_row(row_type)) as cur:
+                await cur.execute(stmt, bind_args)
+                return await cur.fetchall()
+
+    return await _run_with_retries(attempt, operation, _is_idempotent(stmt, idempotent))
+
+
+async def fetch_one(
+    stmt: str,
+    bind_args: tuple,
+    row_type,
+    *,
+    operation: str | None = None,
+    idempotent: bool | None = None,
+) -> Any | None:
+    stmt = _normalize_stmt(stmt)
+
+    async def attempt() -> Any | None:
+        async with get_async_pool().connection() as conn:
+            async with conn.cursor(row_factory=class_row(row_type)) as cur:
+                await cur.execute(stmt, bind_args)
+                return await cur.fetchone()
+
+    return await _run_with_retries(attempt, operation, _is_idempotent(stmt, idempotent))
+
+
+async def fetch_scalar(
+    stmt: str,
+    bind_args: tuple = (),
+    *,
+    operation: str | None = None,
+    idempotent: bool | None = None,
+) -> Any | None:
+    stmt = _normalize_stmt(stmt)
+
+    async def attempt() -> Any | None:
+        async with get_async_pool().connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(stmt, bind_args)
+                row = await cur.fetchone()
+                if row is None:
+                    return None
+                return row[0]
+
+    return await _run_with_retries(attempt, operation, _is_idempotent(stmt, idempotent))
+
+
+async def _run_with_retries(
+    attempt: Callable[[], Awaitable[T]],
+    operation: str | None,
+    idempotent: bool,
+) -> T:
+    for attempt_no in range(1, DB_RETRY_ATTEMPTS + 1):
+        try:
+            return await attempt()
+        except Exception as err:
+            if attempt_no == DB_RETRY_ATTEMPTS or not _should_retry(err, idempotent):
+                raise translate_database_error(err, operation) from err
+            await asyncio.sleep(_retry_delay(operation, attempt_no, err))
+
+    raise AssertionError("unreachable")
+
+
+async def _configure(conn: AsyncConnection) -> None:
+    _register_dumpers(conn)
@@ -4,11 +4,14 @@ import logging
 import os
 import secrets
 from contextvars import ContextVar
+from functools import lru_cache
 
 import psycopg
 from psycopg import OperationalError
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
+from .cache import TTLCache
+
 ENCRYPTED_SECRET_VERSION = b"\x01"
 CONNECT_TIMEOUT_SECS = 2
 CLUSTER_DB_PORT = 26257
@@ -64,8 +67,21 @@ def safe_csv_set(raw_value: str | None) -> set[str]:
     return {part.strip() for part in raw_value.split(",") if part and part.strip()}
 
 
-def _secret_master_key() -> bytes:
-    encoded_key = os.getenv("API_KEY_MASTER_KEY", "").strip()
+# Decrypted API key secrets, keyed by their ciphertext. Memory only.
+_api_key_secret_cache = TTLCache(max_entries=4096, ttl=300)
+
+
+def _secret_cipher() -> AESGCM:
+    return _cipher_for_master_key(os.getenv("API_KEY_MASTER_KEY", "").strip())
+
+
+@lru_cache(maxsize=4)
+def _cipher_for_master_key(encoded_key: str) -> AESGCM:
+    # the env var is read on every call, but only parsed once per value
+    return AESGCM(_secret_master_key(encoded_key))
+
+
+def _secret_master_key(encoded_key: str) -> bytes:
     if not encoded_key:
         raise RuntimeError("API_KEY_MASTER_KEY must be set for secret encryption.")
 
@@ -81,7 +97,7 @@ def _secret_master_key() -> bytes:
 
 
 def validate_secret_crypto_config() -> None:
-    _secret_master_key()
+    _secret_cipher()
 
 
 def validate_api_key_crypto_config() -> None:
@@ -96,7 +112,7 @@ def _secret_bytes(secret: bytes | str) -> bytes:
 
 def encrypt_secret(secret: bytes | str) -> bytes:
     nonce = secrets.token_bytes(12)
-    ciphertext = AESGCM(_secret_master_key()).encrypt(
+    ciphertext = _secret_cipher().encrypt(
         nonce,
         _secret_bytes(secret),
         None,
@@ -119,7 +135,7 @@ def decrypt_secret(secret: bytes | str) -> bytes:
         raise RuntimeError("Encrypted secret is malformed.")
 
     try:
-        return AESGCM(_secret_master_key()).decrypt(nonce, ciphertext, None)
+        return _secret_cipher().decrypt(nonce, ciphertext, None)
     except Exception as exc:
         raise RuntimeError(
             "Encrypted secret could not be decrypted. Check API_KEY_MASTER_KEY and stored key material."
@@ -131,16 +147,24 @@ def encrypt_api_key_secret(secret: bytes | str) -> bytes:
 
 
 def decrypt_api_key_secret(secret: bytes | str) -> bytes:
-    return decrypt_secret(secret)
+    """Decrypt an API key secret, reusing the plaintext of recently seen ciphertexts."""
+    encrypted_secret = _secret_bytes(secret)
+    return _api_key_secret_cache.get_or_load(
+        encrypted_secret, lambda: decrypt_secret(encrypted_secret)
+    )
+
+
+def cluster_db_conninfo(dns_address: str, password: str) -> str:
+    return (
+        f"postgres://{CLUSTER_DB_USERNAME}:{password}"
+        f"@{dns_address}:{CLUSTER_DB_PORT}/{CLUSTER_DB_NAME}?sslmode=require"
+    )
 
 
 def connect_cluster_db(dns_address: str, password: str) -> psycopg.Connection:
     try:
         return psycopg.connect(
-            (
-                f"postgres://{CLUSTER_DB_USERNAME}:{password}"
-                f"@{dns_address}:{CLUSTER_DB_PORT}/{CLUSTER_DB_NAME}?sslmode=require"
-            ),
+            cluster_db_conninfo(dns_address, password),
             autocommit=True,
             connect_timeout=CONNECT_TIMEOUT_SECS,
         )
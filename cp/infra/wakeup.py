@@ -0,0 +1,45 @@
+"""Wakeup signalling between MQ producers and the queue consumer."""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class QueueWakeup:
+    """Thread-safe wrapper around an ``asyncio.Event`` owned by the consumer loop.
+
+    Producers may run on the event loop, in handler threads or in Ansible
+    worker threads, so ``notify`` always hops onto the consumer's loop.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._event: asyncio.Event | None = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._event = asyncio.Event()
+
+    def unbind(self) -> None:
+        self._loop = None
+        self._event = None
+
+    def notify(self) -> None:
+        loop, event = self._loop, self._event
+        if loop is None or event is None:
+            return
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # the consumer loop is already closed
+            logger.debug("Dropping MQ wakeup for a closed event loop")
+
+    async def wait(self) -> None:
+        if self._event is None:
+            raise RuntimeError("QueueWakeup is not bound to an event loop.")
+        await self._event.wait()
+        self._event.clear()
+
+
+queue_wakeup = QueueWakeup()
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import os
 import time
 import uuid
 from contextlib import asynccontextmanager
@@ -9,35 +10,50 @@ from fastapi import FastAPI, Request, Response
 from fastapi.staticfiles import StaticFiles
 
 from . import DB_ENGINE, DB_URL
-from .api import admin, alerts, cluster_recovery, clusters, events, jobs
+from .api import admin, alerts, cluster_recovery, clusters, events, jobs, metrics
 from .auth import oidc
 from .auth import router as auth_router
 from .infra import close_db, get_repo, initialize_postgres, request_id_ctx
+from .infra.db import API_POOL
+from .infra.db_async import close_async_db, initialize_async_postgres
 from .infra.logging import configure_logging
-from .workers.queue import get_nodes, pull_from_mq
+from .workers.queue import MqConsumer, get_nodes, pull_from_mq
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     queue_task: asyncio.Task | None = None
+    consumer: MqConsumer | None = None
 
     if DB_ENGINE == "postgres":
-        initialize_postgres(DB_URL)
+        # with CP_ROLE=api the queue is served by `python -m cp.workers`
+        api_only = os.getenv("CP_ROLE", "both") == "api"
+        if api_only:
+            initialize_postgres(DB_URL, pool_names=(API_POOL,))
+        else:
+            initialize_postgres(DB_URL)
+        # hot read routes use the async pool so they do not block the loop
+        await initialize_async_postgres(DB_URL)
         configure_logging(get_repo(), force=True)
         oidc.validate_config(get_repo())
-        queue_task = asyncio.create_task(pull_from_mq())
+        oidc.start_refresher()
+        if not api_only:
+            consumer = MqConsumer()
+            queue_task = asyncio.create_task(pull_from_mq(consumer))
     else:
         pass
 
     yield
 
-    if queue_task is not None:
-        queue_task.cancel()
+    if queue_task is not None and consumer is not None:
+        consumer.stop()
         try:
             await queue_task
         except asyncio.CancelledError:
             pass
 
+    oidc.stop_refresher()
+    await close_async_db()
     close_db()
 
 
@@ -56,10 +72,11 @@ api.include_router(cluster_recovery.router)
 api.include_router(clusters.router)
 api.include_router(events.router)
 api.include_router(jobs.router)
+api.include_router(metrics.router)
 
 
 @api.get("/prom-targets")
-async def get_targets():
+def get_targets():
     return get_nodes()
 
 
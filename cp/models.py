@@ -1,5 +1,5 @@
 import datetime as dt
-from enum import StrEnum, auto
+from enum import IntEnum, StrEnum, auto
 from typing import Any, Callable, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
@@ -44,6 +44,12 @@ class CommandType(AutoNameStrEnum):
     FAIL_ZOMBIE_JOBS = auto()
 
 
+class MqPriority(IntEnum):
+    INTERACTIVE = 0
+    FOLLOW_UP = 1
+    BACKGROUND = 2
+
+
 class ClusterState(AutoNameStrEnum):
     CREATING = auto()
     ACTIVE = auto()
@@ -113,6 +119,7 @@ class CPRole(AutoNameStrEnum):
 
 class SettingKey(AutoNameStrEnum):
     auth_api_key_signature_ttl_seconds = "auth.api_key_signature_ttl_seconds"
+    auth_api_key_replay_shared = "auth.api_key_replay_shared"
     logging_journald_identifier = "logging.journald_identifier"
     logging_level = "logging.level"
     storage_s3_url = "storage.s3.url"
@@ -668,6 +675,10 @@ class Msg(BaseModel):
     msg_data: Dict[str, Any]
     created_at: dt.datetime
     created_by: str
+    priority: MqPriority = MqPriority.BACKGROUND
+    leased_until: dt.datetime | None = None
+    lease_owner: str | None = None
+    attempts: int = 0
 
 
 class Job(BaseModel):
@@ -775,9 +786,20 @@ class PlaybookSaveRequest(BaseModel):
     content: str
 
 
+class DashboardChartColumns(BaseModel):
+    ts: list[int]
+    series: dict[str, list[float | None]]
+
+
 class DashboardMetrics(BaseModel):
     current_nodes: list[int]
-    chart_data: list[dict[str, Any]]
+    chart_data: list[dict[str, Any]] = Field(default_factory=list)
+    chart_columns: DashboardChartColumns | None = None
+
+
+class FleetMetrics(BaseModel):
+    metrics: list[str]
+    clusters: dict[str, DashboardChartColumns]
 
 
 class DashboardSnapshot(BaseModel):
@@ -1,7 +1,12 @@
 """Repository-layer package."""
 
+from typing import Callable, ContextManager, TypeVar
+
+from psycopg import Connection
 from psycopg_pool import ConnectionPool
 
+from ..infra import db
+
 from .admin import (
     ApiKeysRepo,
     ClusterOptionsRepo,
@@ -20,6 +25,8 @@ from .external_connections import ExternalConnectionsRepo
 from .jobs import JobsRepo
 from .mq import MqRepo
 
+T = TypeVar("T")
+
 
 class Repo(
     ApiKeysRepo,
@@ -41,5 +48,19 @@ class Repo(
     def __init__(self, pool: ConnectionPool) -> None:
         self.pool: ConnectionPool = pool
 
+    def transaction(self) -> ContextManager[Connection]:
+        """Group the repository calls made inside the block into one transaction."""
+        return db.transaction()
+
+    def run_transaction(
+        self,
+        fn: Callable[[], T],
+        *,
+        operation: str | None = None,
+        idempotent: bool = False,
+    ) -> T:
+        """Run ``fn`` in a transaction, retrying it on serialization conflicts."""
+        return db.run_transaction(fn, operation=operation, idempotent=idempotent)
+
 
 __all__ = ["Repo"]
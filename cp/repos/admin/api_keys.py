@@ -1,23 +1,54 @@
 """Admin API keys repository."""
 
+import os
+from datetime import datetime
+
+from ...infra import TTLCache, db_async
 from ...infra.db import execute_stmt, fetch_all, fetch_one
 from ...models import ApiKeyCreateRequestInDB, ApiKeyRecord, ApiKeySummary
 from .base import AdminRepo
 
+# API key records used for request signing are kept in memory for this many
+# seconds; deletes on this replica evict them right away.
+API_KEY_CACHE_TTL_SECONDS = float(os.getenv("API_KEY_CACHE_TTL_SECONDS", "60"))
+API_KEY_CACHE_SIZE = 4096
+
+GET_API_KEY_STMT = """
+    SELECT access_key, encrypted_secret_access_key, owner, valid_until, roles
+    FROM api_keys
+    WHERE access_key = %s
+    """
+
+api_key_cache = TTLCache(max_entries=API_KEY_CACHE_SIZE, ttl=API_KEY_CACHE_TTL_SECONDS)
+
 
 class ApiKeysRepo(AdminRepo):
     def get_api_key(self, access_key: str) -> ApiKeyRecord | None:
         return fetch_one(
-            """
-                    SELECT access_key, encrypted_secret_access_key, owner, valid_until, roles
-                    FROM api_keys
-                    WHERE access_key = %s
-                    """,
+            GET_API_KEY_STMT,
             (access_key,),
             ApiKeyRecord,
             operation="api_keys.get",
         )
 
+    async def get_cached_api_key_async(self, access_key: str) -> ApiKeyRecord | None:
+        """Look up an API key for request authentication, served from memory when fresh."""
+        api_key = api_key_cache.get(access_key)
+        if api_key is not None:
+            return api_key
+
+        api_key = await db_async.fetch_one(
+            GET_API_KEY_STMT,
+            (access_key,),
+            ApiKeyRecord,
+            operation="api_keys.get",
+        )
+        # unknown keys are not cached so a key created on another replica
+        # works as soon as it exists
+        if api_key is not None:
+            api_key_cache.set(access_key, api_key)
+        return api_key
+
     def list_api_keys(self, access_key: str | None = None) -> list[ApiKeySummary]:
         params: list[str] = []
         sql = """
@@ -63,6 +94,25 @@ class ApiKeysRepo(AdminRepo):
             operation="api_keys.create",
         )
 
+    async def claim_api_key_nonce_async(
+        self, nonce: bytes, expires_at: datetime
+    ) -> bool:
+        """Record a signed request fingerprint; ``False`` if it is still recorded."""
+        # expired rows may linger until the TTL job runs, so they are reclaimable
+        claimed = await db_async.fetch_scalar(
+            """
+            INSERT INTO api_key_nonces (nonce, expires_at)
+            VALUES (%s, %s)
+            ON CONFLICT (nonce) DO UPDATE
+                SET expires_at = excluded.expires_at
+                WHERE api_key_nonces.expires_at <= now()
+            RETURNING 1
+            """,
+            (nonce, expires_at),
+            operation="api_keys.claim_nonce",
+        )
+        return claimed is not None
+
     def delete_api_key(self, access_key: str) -> None:
         execute_stmt(
             """
@@ -73,3 +123,4 @@ class ApiKeysRepo(AdminRepo):
             (access_key,),
             operation="api_keys.delete",
         )
+        api_key_cache.invalidate(access_key)
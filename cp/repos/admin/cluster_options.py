@@ -1,6 +1,6 @@
 """Admin cluster options repository."""
 
-from ...infra.db import execute_stmt, fetch_all
+from ...infra.db import DynamicStmt, execute_stmt, fetch_all, transaction
 from ...models import (
     ClusterDatabaseObject,
     ClusterDatabaseRole,
@@ -310,11 +310,11 @@ class ClusterOptionsRepo(AdminRepo):
 
         placeholders = ", ".join(["%s"] * len(database_roles))
         execute_stmt(
-            f"""
-            DELETE FROM cluster_database_roles
-            WHERE cluster_id = %s
-            AND database_role NOT IN ({placeholders})
-            """,
+            DynamicStmt(f"""
+                DELETE FROM cluster_database_roles
+                WHERE cluster_id = %s
+                AND database_role NOT IN ({placeholders})
+                """),
             (cluster_id, *database_roles),
         )
 
@@ -356,43 +356,44 @@ class ClusterOptionsRepo(AdminRepo):
         updated_by: str,
     ) -> None:
         """Replace the full group set for a generated database role."""
-        if not group_names:
+        with transaction():
+            if not group_names:
+                execute_stmt(
+                    """
+                    DELETE
+                    FROM cluster_database_role_group_mappings
+                    WHERE cluster_id = %s AND database_role = %s
+                    """,
+                    (cluster_id, database_role),
+                )
+                return
+
+            placeholders = ", ".join(["%s"] * len(group_names))
             execute_stmt(
-                """
-                DELETE
-                FROM cluster_database_role_group_mappings
-                WHERE cluster_id = %s AND database_role = %s
-                """,
-                (cluster_id, database_role),
+                DynamicStmt(f"""
+                    DELETE
+                    FROM cluster_database_role_group_mappings
+                    WHERE cluster_id = %s AND database_role = %s
+                    AND group_name NOT IN ({placeholders})
+                    """),
+                (cluster_id, database_role, *group_names),
             )
-            return
-
-        placeholders = ", ".join(["%s"] * len(group_names))
-        execute_stmt(
-            f"""
-            DELETE
-            FROM cluster_database_role_group_mappings
-            WHERE cluster_id = %s AND database_role = %s
-            AND group_name NOT IN ({placeholders})
-            """,
-            (cluster_id, database_role, *group_names),
-        )
 
-        for group_name in group_names:
-            execute_stmt(
-                """
-                INSERT INTO cluster_database_role_group_mappings (
-                    cluster_id,
-                    database_role,
-                    group_name,
-                    created_by,
-                    updated_by
+            for group_name in group_names:
+                execute_stmt(
+                    """
+                    INSERT INTO cluster_database_role_group_mappings (
+                        cluster_id,
+                        database_role,
+                        group_name,
+                        created_by,
+                        updated_by
+                    )
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON CONFLICT (cluster_id, database_role, group_name)
+                    DO UPDATE SET
+                        updated_by = excluded.updated_by,
+                        updated_at = now():::TIMESTAMPTZ
+                    """,
+                    (cluster_id, database_role, group_name, updated_by, updated_by),
                 )
-                VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT (cluster_id, database_role, group_name)
-                DO UPDATE SET
-                    updated_by = excluded.updated_by,
-                    updated_at = now():::TIMESTAMPTZ
-                """,
-                (cluster_id, database_role, group_name, updated_by, updated_by),
-            )
@@ -1,50 +1,143 @@
 """Admin settings repository."""
 
+import datetime as dt
+import os
+import threading
+import time
+from typing import NamedTuple
+
 from ...infra.db import fetch_all, fetch_one
 from ...models import SettingKey, SettingRecord
 from .base import AdminRepo
 
+SETTINGS_CACHE_TTL_SECONDS = float(os.getenv("SETTINGS_CACHE_TTL_SECONDS", "5"))
+# Full reload interval, covering writes whose commit timestamp lands below the
+# high-water mark already seen.
+SETTINGS_CACHE_MAX_AGE_SECONDS = 60
+
+LIST_SETTINGS_STMT = """
+    SELECT
+        key,
+        COALESCE(value, default_value) AS value,
+        default_value,
+        value_type,
+        category,
+        is_secret,
+        description,
+        updated_at,
+        updated_by
+    FROM settings
+    ORDER BY category, key
+    """
+
+
+class SettingsVersion(NamedTuple):
+    updated_at: dt.datetime | None
+    total: int
+
+
+class SettingsCache:
+    """Process-wide snapshot of the ``settings`` table.
+
+    The snapshot is loaded in bulk. Once it is older than ``ttl`` seconds, a
+    cheap high-water-mark query (latest ``updated_at`` plus row count) decides
+    whether another replica changed a setting and the table must be reloaded.
+    Local updates invalidate the snapshot right away.
+
+    Refreshes are single-flight and run without holding the lock: while one
+    caller refreshes, the others keep reading the previous snapshot and only
+    the very first load makes them wait.
+    """
+
+    def __init__(self, ttl: float = SETTINGS_CACHE_TTL_SECONDS) -> None:
+        self.ttl = ttl
+        self._records: list[SettingRecord] = []
+        self._by_key: dict[str, SettingRecord] = {}
+        self._version: SettingsVersion | None = None
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+        self._loaded = False
+        self._refreshing = False
+        # bumped by invalidate so an in-flight refresh cannot mark its
+        # possibly older result as current
+        self._generation = 0
+        self._cond = threading.Condition()
+
+    def records(self) -> list[SettingRecord]:
+        self._refresh()
+        return list(self._records)
+
+    def get(self, key: SettingKey | str) -> SettingRecord | None:
+        self._refresh()
+        return self._by_key.get(str(key))
+
+    def invalidate(self) -> None:
+        with self._cond:
+            self._version = None
+            self._generation += 1
+
+    def _refresh(self) -> None:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._version is not None and now - self._checked_at < self.ttl:
+                    return
+                if not self._refreshing:
+                    break
+                if self._loaded:
+                    return
+                self._cond.wait()
+            self._refreshing = True
+            generation = self._generation
+            known_version = self._version
+            loaded_at = self._loaded_at
+
+        records: list[SettingRecord] | None = None
+        refreshed = False
+        try:
+            version = fetch_one(
+                """
+                SELECT max(updated_at) AS updated_at, count(*) AS total
+                FROM settings
+                """,
+                (),
+                SettingsVersion,
+                operation="settings.get_version",
+            )
+            if (
+                version != known_version
+                or now - loaded_at >= SETTINGS_CACHE_MAX_AGE_SECONDS
+            ):
+                records = fetch_all(
+                    LIST_SETTINGS_STMT,
+                    (),
+                    SettingRecord,
+                    operation="settings.list_settings",
+                )
+            refreshed = True
+        finally:
+            with self._cond:
+                self._refreshing = False
+                if records is not None:
+                    self._records = records
+                    self._by_key = {str(record.key): record for record in records}
+                    self._loaded_at = now
+                    self._loaded = True
+                if refreshed and generation == self._generation:
+                    self._version = version
+                    self._checked_at = now
+                self._cond.notify_all()
+
+
+settings_cache = SettingsCache()
+
 
 class SettingsRepo(AdminRepo):
     def list_settings(self) -> list[SettingRecord]:
-        return fetch_all(
-            """
-            SELECT
-                key,
-                COALESCE(value, default_value) AS value,
-                default_value,
-                value_type,
-                category,
-                is_secret,
-                description,
-                updated_at,
-                updated_by
-            FROM settings
-            ORDER BY category, key
-            """,
-            (),
-            SettingRecord,
-        )
+        return settings_cache.records()
 
     def get_setting(self, key: SettingKey) -> SettingRecord | None:
-        return fetch_one(
-            """
-            SELECT
-                key,
-                COALESCE(value, default_value) AS value,
-                default_value,
-                value_type,
-                category,
-                is_secret,
-                description,
-                updated_at,
-                updated_by
-            FROM settings
-            WHERE key = %s
-            """,
-            (key,),
-            SettingRecord,
-        )
+        return settings_cache.get(key)
 
     def update_setting(
         self,
@@ -52,7 +145,7 @@ class SettingsRepo(AdminRepo):
         value,
         updated_by: str | None = None,
     ) -> SettingRecord | None:
-        return fetch_one(
+        record = fetch_one(
             """
             UPDATE settings
             SET
@@ -74,13 +167,15 @@ class SettingsRepo(AdminRepo):
             (value, updated_by, key),
             SettingRecord,
         )
+        settings_cache.invalidate()
+        return record
 
     def reset_setting(
         self,
         key: SettingKey,
         updated_by: str | None = None,
     ) -> SettingRecord | None:
-        return fetch_one(
+        record = fetch_one(
             """
             UPDATE settings
             SET
@@ -102,3 +197,5 @@ class SettingsRepo(AdminRepo):
             (updated_by, key),
             SettingRecord,
         )
+        settings_cache.invalidate()
+        return record
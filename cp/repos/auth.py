@@ -1,8 +1,23 @@
 """Auth/support repository."""
 
+from ..infra import db_async
 from ..infra.db import execute_stmt, fetch_all, fetch_one, fetch_scalar
 from ..models import OIDCSessionRecord, RoleGroupMap
 
+GET_OIDC_SESSION_STMT = """
+    SELECT
+        session_id,
+        encrypted_id_token,
+        encrypted_refresh_token,
+        token_expires_at,
+        session_expires_at,
+        created_at,
+        updated_at
+    FROM oidc_sessions
+    WHERE session_id = %s
+        AND session_expires_at > now()
+    """
+
 
 class AuthRepo:
 
@@ -30,19 +45,15 @@ class AuthRepo:
 
     def get_oidc_session(self, session_id: str) -> OIDCSessionRecord | None:
         return fetch_one(
-            """
-            SELECT
-                session_id,
-                encrypted_id_token,
-                encrypted_refresh_token,
-                token_expires_at,
-                session_expires_at,
-                created_at,
-                updated_at
-            FROM oidc_sessions
-            WHERE session_id = %s
-                AND session_expires_at > now()
-            """,
+            GET_OIDC_SESSION_STMT,
+            (session_id,),
+            OIDCSessionRecord,
+            operation="auth.get_oidc_session",
+        )
+
+    async def get_oidc_session_async(self, session_id: str) -> OIDCSessionRecord | None:
+        return await db_async.fetch_one(
+            GET_OIDC_SESSION_STMT,
             (session_id,),
             OIDCSessionRecord,
             operation="auth.get_oidc_session",
@@ -93,6 +104,20 @@ class AuthRepo:
             operation="auth.update_oidc_session",
         )
 
+    async def oidc_session_exists_async(self, session_id: str) -> bool:
+        return bool(
+            await db_async.fetch_scalar(
+                """
+                SELECT count(*)
+                FROM oidc_sessions
+                WHERE session_id = %s
+                    AND session_expires_at > now()
+                """,
+                (session_id,),
+                operation="auth.oidc_session_exists",
+            )
+        )
+
     def delete_oidc_session(self, session_id: str) -> None:
         execute_stmt(
             """
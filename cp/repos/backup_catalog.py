@@ -2,9 +2,24 @@
 
 import datetime as dt
 
-from ..infra.db import execute_stmt, fetch_all, fetch_one
+from ..infra.db import (
+    DynamicStmt,
+    execute_stmt,
+    fetch_all,
+    fetch_one,
+    run_transaction,
+)
 from ..models import BackupCatalogEntry, BackupCatalogEntryUpsert
 
+# Rows per multi-row INSERT of backup objects, keeping each statement well
+# below the bind parameter limit.
+OBJECT_INSERT_BATCH_SIZE = 1000
+
+
+def _placeholders(row_count: int, column_count: int) -> str:
+    row = "(" + ", ".join(["%s"] * column_count) + ")"
+    return ", ".join([row] * row_count)
+
 
 class BackupCatalogRepo:
     def list_backup_catalog(
@@ -71,108 +86,157 @@ class BackupCatalogRepo:
             operation="backup_catalog.get",
         )
 
-    def replace_cluster_backup_catalog(
+    def list_cluster_backup_catalog_paths(
         self,
         cluster_id: str,
-        entries: list[BackupCatalogEntryUpsert],
-    ) -> None:
-        now = dt.datetime.now(dt.timezone.utc)
-        execute_stmt(
+    ) -> list[BackupCatalogEntry]:
+        return fetch_all(
             """
-            UPDATE cluster_backup_catalog
-            SET status = 'NOT_SEEN_RECENTLY',
-                updated_at = now()
+            SELECT cluster_id, backup_path, status
+            FROM cluster_backup_catalog
             WHERE cluster_id = %s
             """,
             (cluster_id,),
-            operation="backup_catalog.mark_cluster_stale",
+            BackupCatalogEntry,
+            operation="backup_catalog.list_cluster_paths",
         )
 
-        for entry in entries:
-            execute_stmt(
+    def sync_cluster_backup_catalog(
+        self,
+        cluster_id: str,
+        seen_paths: list[str],
+        entries: list[BackupCatalogEntryUpsert],
+    ) -> None:
+        """Apply one catalog sync of ``cluster_id`` in a single transaction.
+
+        ``seen_paths`` are all paths currently in backup storage; ``entries``
+        are the ones that were (re)read from storage. Cataloged paths missing
+        from storage are flagged NOT_SEEN_RECENTLY.
+        """
+        now = dt.datetime.now(dt.timezone.utc)
+        statements: list[tuple[str, tuple]] = [
+            (
                 """
-                UPSERT INTO cluster_backup_catalog (
-                    cluster_id,
-                    backup_path,
-                    grp,
-                    backup_type,
-                    start_time,
-                    end_time,
-                    is_full_cluster,
-                    status,
-                    object_count,
-                    last_seen_at,
-                    sync_error
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                )
+                UPDATE cluster_backup_catalog
+                SET status = 'NOT_SEEN_RECENTLY'
+                WHERE cluster_id = %s
+                    AND backup_path <> ALL (%s::STRING[])
+                    AND status <> 'NOT_SEEN_RECENTLY'
                 """,
-                (
-                    entry.cluster_id,
-                    entry.backup_path,
-                    entry.grp,
-                    entry.backup_type,
-                    entry.start_time,
-                    entry.end_time,
-                    entry.is_full_cluster,
-                    entry.status,
-                    entry.object_count,
-                    now,
-                    entry.sync_error,
-                ),
-                operation="backup_catalog.upsert_entry",
-            )
-            execute_stmt(
+                (cluster_id, seen_paths),
+            ),
+            (
                 """
-                DELETE FROM cluster_backup_catalog_objects
+                UPDATE cluster_backup_catalog
+                SET last_seen_at = %s
                 WHERE cluster_id = %s
-                    AND backup_path = %s
+                    AND backup_path = ANY (%s::STRING[])
                 """,
-                (entry.cluster_id, entry.backup_path),
-                operation="backup_catalog.delete_objects",
+                (now, cluster_id, seen_paths),
+            ),
+        ]
+
+        if entries:
+            statements.append(
+                (
+                    DynamicStmt(f"""
+                        UPSERT INTO cluster_backup_catalog (
+                            cluster_id,
+                            backup_path,
+                            grp,
+                            backup_type,
+                            start_time,
+                            end_time,
+                            is_full_cluster,
+                            status,
+                            object_count,
+                            last_seen_at,
+                            sync_error
+                        ) VALUES {_placeholders(len(entries), 11)}
+                        """),
+                    tuple(
+                        value
+                        for entry in entries
+                        for value in (
+                            entry.cluster_id,
+                            entry.backup_path,
+                            entry.grp,
+                            entry.backup_type,
+                            entry.start_time,
+                            entry.end_time,
+                            entry.is_full_cluster,
+                            entry.status,
+                            entry.object_count,
+                            now,
+                            entry.sync_error,
+                        )
+                    ),
+                )
             )
-            for obj in entry.objects:
-                execute_stmt(
+            statements.append(
+                (
                     """
-                    INSERT INTO cluster_backup_catalog_objects (
-                        cluster_id,
-                        backup_path,
-                        ordinal,
-                        database_name,
-                        parent_schema_name,
-                        object_name,
-                        object_type,
-                        backup_type,
-                        start_time,
-                        end_time,
-                        size_bytes,
-                        row_count,
-                        is_full_cluster,
-                        regions,
-                        last_seen_at
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                    )
+                    DELETE FROM cluster_backup_catalog_objects
+                    WHERE cluster_id = %s
+                        AND backup_path = ANY (%s::STRING[])
                     """,
-                    (
-                        entry.cluster_id,
-                        entry.backup_path,
-                        obj.ordinal,
-                        obj.database_name,
-                        obj.parent_schema_name,
-                        obj.object_name,
-                        obj.object_type,
-                        obj.backup_type,
-                        obj.start_time,
-                        obj.end_time,
-                        obj.size_bytes,
-                        obj.row_count,
-                        obj.is_full_cluster,
-                        obj.regions,
-                        now,
+                    (cluster_id, [entry.backup_path for entry in entries]),
+                )
+            )
+
+        objects = [(entry, obj) for entry in entries for obj in entry.objects]
+        for idx in range(0, len(objects), OBJECT_INSERT_BATCH_SIZE):
+            batch = objects[idx : idx + OBJECT_INSERT_BATCH_SIZE]
+            statements.append(
+                (
+                    DynamicStmt(f"""
+                        INSERT INTO cluster_backup_catalog_objects (
+                            cluster_id,
+                            backup_path,
+                            ordinal,
+                            database_name,
+                            parent_schema_name,
+                            object_name,
+                            object_type,
+                            backup_type,
+                            start_time,
+                            end_time,
+                            size_bytes,
+                            row_count,
+                            is_full_cluster,
+                            regions,
+                            last_seen_at
+                        ) VALUES {_placeholders(len(batch), 15)}
+                        """),
+                    tuple(
+                        value
+                        for entry, obj in batch
+                        for value in (
+                            entry.cluster_id,
+                            entry.backup_path,
+                            obj.ordinal,
+                            obj.database_name,
+                            obj.parent_schema_name,
+                            obj.object_name,
+                            obj.object_type,
+                            obj.backup_type,
+                            obj.start_time,
+                            obj.end_time,
+                            obj.size_bytes,
+                            obj.row_count,
+                            obj.is_full_cluster,
+                            obj.regions,
+                            now,
+                        )
                     ),
-                    operation="backup_catalog.insert_object",
                 )
+            )
+
+        def apply() -> None:
+            for stmt, args in statements:
+                execute_stmt(stmt, args, operation="backup_catalog.sync_cluster")
+
+        run_transaction(apply, operation="backup_catalog.sync_cluster", idempotent=True)
 
     def mark_cluster_backup_catalog_unavailable(
         self,
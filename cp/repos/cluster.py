@@ -2,6 +2,7 @@
 
 from pydantic import TypeAdapter
 
+from ..infra import db_async
 from ..infra.db import execute_stmt, fetch_all, fetch_one
 from ..models import (
     Cluster,
@@ -13,6 +14,90 @@ from ..models import (
     Nodes,
 )
 
+LIST_CLUSTERS_ADMIN_STMT = """
+    SELECT cluster_id, grp,
+        created_by, status,
+        version, node_count,
+        node_cpus, disk_size
+    FROM clusters
+    ORDER BY created_at DESC
+    """
+
+LIST_CLUSTERS_STMT = """
+    SELECT cluster_id, grp,
+        created_by, status,
+        version, node_count,
+        node_cpus, disk_size
+    FROM clusters
+    WHERE grp = ANY (%s)
+    ORDER BY created_at DESC
+    """
+
+GET_CLUSTER_ADMIN_STMT = """
+    SELECT *
+    FROM clusters
+    WHERE cluster_id = %s
+    """
+
+GET_CLUSTER_STMT = """
+    SELECT *
+    FROM clusters
+    WHERE grp = ANY (%s)
+        AND cluster_id = %s
+    """
+
+
+def _cluster_stats_query(groups: list[str], is_admin: bool) -> tuple[str, tuple, str]:
+    params: tuple = ()
+    where_clause = ""
+    operation = "cluster.get_cluster_stats.admin"
+    if not is_admin:
+        where_clause = "WHERE grp = ANY (%s)"
+        params = (groups,)
+        operation = "cluster.get_cluster_stats"
+
+    stmt = f"""
+        SELECT
+            COUNT(*) AS total,
+            COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS active,
+            COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS creating,
+            COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS unhealthy,
+            COALESCE(
+                SUM(
+                    CASE
+                        WHEN status IN (%s, %s, %s, %s, %s)
+                        THEN 1
+                        ELSE 0
+                    END
+                ),
+                0
+            ) AS failed
+        FROM clusters
+        {where_clause}
+        """
+    bind_args = (
+        ClusterState.ACTIVE.value,
+        ClusterState.CREATING.value,
+        ClusterState.UNHEALTHY.value,
+        ClusterState.CREATE_FAILED.value,
+        ClusterState.SCALE_FAILED.value,
+        ClusterState.RESTORE_FAILED.value,
+        ClusterState.DELETE_FAILED.value,
+        ClusterState.UPGRADE_FAILED.value,
+        *params,
+    )
+    return stmt, bind_args, operation
+
+
+def _empty_cluster_stats() -> ClusterStatsResponse:
+    return ClusterStatsResponse(
+        total=0,
+        active=0,
+        creating=0,
+        unhealthy=0,
+        failed=0,
+    )
+
 
 class ClusterRepo:
     def get_cluster_stats(
@@ -20,56 +105,23 @@ class ClusterRepo:
         groups: list[str],
         is_admin: bool = False,
     ) -> ClusterStatsResponse:
-        params: tuple = ()
-        where_clause = ""
-        operation = "cluster.get_cluster_stats.admin"
-        if not is_admin:
-            where_clause = "WHERE grp = ANY (%s)"
-            params = (groups,)
-            operation = "cluster.get_cluster_stats"
+        stmt, bind_args, operation = _cluster_stats_query(groups, is_admin)
+        return (
+            fetch_one(stmt, bind_args, ClusterStatsResponse, operation=operation)
+            or _empty_cluster_stats()
+        )
 
+    async def get_cluster_stats_async(
+        self,
+        groups: list[str],
+        is_admin: bool = False,
+    ) -> ClusterStatsResponse:
+        stmt, bind_args, operation = _cluster_stats_query(groups, is_admin)
         return (
-            fetch_one(
-                f"""
-            SELECT
-                COUNT(*) AS total,
-                COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS active,
-                COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS creating,
-                COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS unhealthy,
-                COALESCE(
-                    SUM(
-                        CASE
-                            WHEN status IN (%s, %s, %s, %s, %s)
-                            THEN 1
-                            ELSE 0
-                        END
-                    ),
-                    0
-                ) AS failed
-            FROM clusters
-            {where_clause}
-            """,
-                (
-                    ClusterState.ACTIVE.value,
-                    ClusterState.CREATING.value,
-                    ClusterState.UNHEALTHY.value,
-                    ClusterState.CREATE_FAILED.value,
-                    ClusterState.SCALE_FAILED.value,
-                    ClusterState.RESTORE_FAILED.value,
-                    ClusterState.DELETE_FAILED.value,
-                    ClusterState.UPGRADE_FAILED.value,
-                    *params,
-                ),
-                ClusterStatsResponse,
-                operation=operation,
-            )
-            or ClusterStatsResponse(
-                total=0,
-                active=0,
-                creating=0,
-                unhealthy=0,
-                failed=0,
+            await db_async.fetch_one(
+                stmt, bind_args, ClusterStatsResponse, operation=operation
             )
+            or _empty_cluster_stats()
         )
 
     def list_clusters(
@@ -79,29 +131,34 @@ class ClusterRepo:
     ) -> list[ClusterOverview]:
         if is_admin:
             return fetch_all(
-                """
-                SELECT cluster_id, grp,
-                    created_by, status,
-                    version, node_count,
-                    node_cpus, disk_size
-                FROM clusters
-                ORDER BY created_at DESC
-                """,
+                LIST_CLUSTERS_ADMIN_STMT,
                 (),
                 ClusterOverview,
                 operation="cluster.list_clusters.admin",
             )
 
         return fetch_all(
-            """
-            SELECT cluster_id, grp,
-                created_by, status,
-                version, node_count,
-                node_cpus, disk_size
-            FROM clusters
-            WHERE grp = ANY (%s)
-            ORDER BY created_at DESC
-            """,
+            LIST_CLUSTERS_STMT,
+            (groups,),
+            ClusterOverview,
+            operation="cluster.list_clusters",
+        )
+
+    async def list_clusters_async(
+        self,
+        groups: list[str],
+        is_admin: bool = False,
+    ) -> list[ClusterOverview]:
+        if is_admin:
+            return await db_async.fetch_all(
+                LIST_CLUSTERS_ADMIN_STMT,
+                (),
+                ClusterOverview,
+                operation="cluster.list_clusters.admin",
+            )
+
+        return await db_async.fetch_all(
+            LIST_CLUSTERS_STMT,
             (groups,),
             ClusterOverview,
             operation="cluster.list_clusters",
@@ -115,23 +172,35 @@ class ClusterRepo:
     ) -> Cluster | None:
         if is_admin:
             return fetch_one(
-                """
-                SELECT *
-                FROM clusters
-                WHERE cluster_id = %s
-                """,
+                GET_CLUSTER_ADMIN_STMT,
                 (cluster_id,),
                 Cluster,
                 operation="cluster.get_cluster.admin",
             )
 
         return fetch_one(
-            """
-            SELECT *
-            FROM clusters
-            WHERE grp = ANY (%s)
-                AND cluster_id = %s
-            """,
+            GET_CLUSTER_STMT,
+            (groups, cluster_id),
+            Cluster,
+            operation="cluster.get_cluster",
+        )
+
+    async def get_cluster_async(
+        self,
+        cluster_id: str,
+        groups: list[str],
+        is_admin: bool = False,
+    ) -> Cluster | None:
+        if is_admin:
+            return await db_async.fetch_one(
+                GET_CLUSTER_ADMIN_STMT,
+                (cluster_id,),
+                Cluster,
+                operation="cluster.get_cluster.admin",
+            )
+
+        return await db_async.fetch_one(
+            GET_CLUSTER_STMT,
             (groups, cluster_id),
             Cluster,
             operation="cluster.get_cluster",
@@ -1,8 +1,22 @@
 """Event repository."""
 
+from ..infra import db_async
 from ..infra.db import execute_stmt, fetch_all, fetch_scalar
 from ..models import LogMsg
 
+LIST_EVENTS_STMT = """
+    SELECT ts, user_id, action, details, request_id::TEXT
+    FROM event_log
+    ORDER BY ts DESC
+    LIMIT %s
+    OFFSET %s
+    """
+
+EVENT_COUNT_STMT = """
+    SELECT count(*) AS id
+    FROM event_log AS OF SYSTEM TIME follower_read_timestamp()
+    """
+
 
 class EventRepo:
     def list_events(
@@ -14,13 +28,24 @@ class EventRepo:
     ) -> list[LogMsg]:
         if is_admin:
             return fetch_all(
-                """
-                SELECT ts, user_id, action, details, request_id::TEXT
-                FROM event_log
-                ORDER BY ts DESC
-                LIMIT %s
-                OFFSET %s
-                """,
+                LIST_EVENTS_STMT,
+                (limit, offset),
+                LogMsg,
+                operation="events.list_events",
+            )
+
+        return []
+
+    async def list_events_async(
+        self,
+        limit: int,
+        offset: int,
+        groups: list[str] | None = None,
+        is_admin: bool = False,
+    ) -> list[LogMsg]:
+        if is_admin:
+            return await db_async.fetch_all(
+                LIST_EVENTS_STMT,
                 (limit, offset),
                 LogMsg,
                 operation="events.list_events",
@@ -30,10 +55,14 @@ class EventRepo:
 
     def get_event_count(self) -> int:
         return fetch_scalar(
-            """
-            SELECT count(*) AS id
-            FROM event_log AS OF SYSTEM TIME follower_read_timestamp()
-            """,
+            EVENT_COUNT_STMT,
+            (),
+            operation="events.get_event_count",
+        )
+
+    async def get_event_count_async(self) -> int:
+        return await db_async.fetch_scalar(
+            EVENT_COUNT_STMT,
             (),
             operation="events.get_event_count",
         )
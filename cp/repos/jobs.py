@@ -1,6 +1,7 @@
 """Jobs repository."""
 
-from ..infra.db import execute_stmt, fetch_all, fetch_one
+from ..infra import db_async
+from ..infra.db import DynamicStmt, execute_stmt, fetch_all, fetch_one
 from ..models import (
     ClusterIDRef,
     CommandType,
@@ -11,133 +12,144 @@ from ..models import (
     Task,
 )
 
+JOB_STATS_ADMIN_STMT = """
+    SELECT
+        COUNT(*) AS total,
+        COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS running,
+        COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS queued,
+        COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS failed
+    FROM jobs
+    """
+
+JOB_STATS_STMT = """
+    WITH
+    c AS (
+        SELECT cluster_id
+        FROM clusters
+        WHERE grp = ANY (%s)
+    ),
+    cj AS (
+        SELECT DISTINCT job_id
+        FROM map_clusters_jobs
+        WHERE cluster_id IN (SELECT * FROM c)
+    )
+    SELECT
+        COUNT(*) AS total,
+        COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS running,
+        COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS queued,
+        COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS failed
+    FROM jobs
+    WHERE job_id IN (SELECT * FROM cj)
+    """
+
+LIST_JOBS_ADMIN_STMT = """
+    SELECT *
+    FROM jobs
+    ORDER BY created_at DESC
+    """
+
+LIST_JOBS_STMT = """
+    WITH
+    c AS (
+        SELECT cluster_id
+        FROM clusters
+        WHERE grp = ANY (%s)
+    ),
+    cj AS (
+        SELECT job_id
+        FROM map_clusters_jobs
+        WHERE cluster_id IN (SELECT * FROM c)
+    )
+    SELECT *
+    FROM jobs
+    WHERE job_id IN (SELECT * FROM cj)
+    ORDER BY created_at DESC;
+    """
+
+GET_JOB_ADMIN_STMT = """
+    SELECT *
+    FROM jobs
+    WHERE job_id = %s
+    """
+
+GET_JOB_STMT = """
+    WITH
+    c AS (
+        SELECT cluster_id
+        FROM clusters
+        WHERE grp = ANY (%s)
+    ),
+    cj AS (
+        SELECT job_id
+        FROM map_clusters_jobs
+        WHERE cluster_id IN (SELECT * FROM c)
+    )
+    SELECT *
+    FROM jobs
+    WHERE job_id IN (SELECT * FROM cj)
+        AND job_id = %s
+    """
+
+_JOB_STATE_COUNTS = (
+    JobState.RUNNING.value,
+    JobState.QUEUED.value,
+    JobState.FAILED.value,
+)
+
+
+def _job_stats_query(groups: list[str], is_admin: bool) -> tuple[str, tuple]:
+    if is_admin:
+        return JOB_STATS_ADMIN_STMT, _JOB_STATE_COUNTS
+    return JOB_STATS_STMT, (groups, *_JOB_STATE_COUNTS)
+
+
+def _empty_job_stats() -> JobStatsResponse:
+    return JobStatsResponse(total=0, running=0, queued=0, failed=0)
+
 
 class JobsRepo:
     def get_job_stats(
         self, groups: list[str], is_admin: bool = False
     ) -> JobStatsResponse:
-        if is_admin:
-            return (
-                fetch_one(
-                    """
-                SELECT
-                    COUNT(*) AS total,
-                    COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS running,
-                    COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS queued,
-                    COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS failed
-                FROM jobs
-                """,
-                    (
-                        JobState.RUNNING.value,
-                        JobState.QUEUED.value,
-                        JobState.FAILED.value,
-                    ),
-                    JobStatsResponse,
-                )
-                or JobStatsResponse(total=0, running=0, queued=0, failed=0)
-            )
+        stmt, bind_args = _job_stats_query(groups, is_admin)
+        return fetch_one(stmt, bind_args, JobStatsResponse) or _empty_job_stats()
 
+    async def get_job_stats_async(
+        self, groups: list[str], is_admin: bool = False
+    ) -> JobStatsResponse:
+        stmt, bind_args = _job_stats_query(groups, is_admin)
         return (
-            fetch_one(
-                """
-            WITH
-            c AS (
-                SELECT cluster_id
-                FROM clusters
-                WHERE grp = ANY (%s)
-            ),
-            cj AS (
-                SELECT DISTINCT job_id
-                FROM map_clusters_jobs
-                WHERE cluster_id IN (SELECT * FROM c)
-            )
-            SELECT
-                COUNT(*) AS total,
-                COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS running,
-                COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS queued,
-                COALESCE(SUM(CASE WHEN status = %s THEN 1 ELSE 0 END), 0) AS failed
-            FROM jobs
-            WHERE job_id IN (SELECT * FROM cj)
-            """,
-                (
-                    groups,
-                    JobState.RUNNING.value,
-                    JobState.QUEUED.value,
-                    JobState.FAILED.value,
-                ),
-                JobStatsResponse,
-            )
-            or JobStatsResponse(total=0, running=0, queued=0, failed=0)
+            await db_async.fetch_one(stmt, bind_args, JobStatsResponse)
+            or _empty_job_stats()
         )
 
     def list_jobs(self, groups: list[str], is_admin: bool = False) -> list[Job]:
         if is_admin:
-            return fetch_all(
-                """
-                SELECT *
-                FROM jobs
-                ORDER BY created_at DESC
-                """,
-                (),
-                Job,
-            )
+            return fetch_all(LIST_JOBS_ADMIN_STMT, (), Job)
 
-        return fetch_all(
-            """
-            WITH
-            c AS (
-                SELECT cluster_id
-                FROM clusters
-                WHERE grp = ANY (%s)
-            ),
-            cj AS (
-                SELECT job_id
-                FROM map_clusters_jobs
-                WHERE cluster_id IN (SELECT * FROM c)
-            )
-            SELECT *
-            FROM jobs
-            WHERE job_id IN (SELECT * FROM cj)
-            ORDER BY created_at DESC;
-            """,
-            (groups,),
-            Job,
-        )
+        return fetch_all(LIST_JOBS_STMT, (groups,), Job)
+
+    async def list_jobs_async(
+        self, groups: list[str], is_admin: bool = False
+    ) -> list[Job]:
+        if is_admin:
+            return await db_async.fetch_all(LIST_JOBS_ADMIN_STMT, (), Job)
+
+        return await db_async.fetch_all(LIST_JOBS_STMT, (groups,), Job)
 
     def get_job(
         self, job_id: int, groups: list[str], is_admin: bool = False
     ) -> Job | None:
         if is_admin:
-            return fetch_one(
-                """
-                SELECT *
-                FROM jobs
-                WHERE job_id = %s
-                """,
-                (job_id,),
-                Job,
-            )
-        return fetch_one(
-            """
-            WITH
-            c AS (
-                SELECT cluster_id
-                FROM clusters
-                WHERE grp = ANY (%s)
-            ),
-            cj AS (
-                SELECT job_id
-                FROM map_clusters_jobs
-                WHERE cluster_id IN (SELECT * FROM c)
-            )
-            SELECT *
-            FROM jobs
-            WHERE job_id IN (SELECT * FROM cj)
-                AND job_id = %s
-            """,
-            (groups, job_id),
-            Job,
-        )
+            return fetch_one(GET_JOB_ADMIN_STMT, (job_id,), Job)
+        return fetch_one(GET_JOB_STMT, (groups, job_id), Job)
+
+    async def get_job_async(
+        self, job_id: int, groups: list[str], is_admin: bool = False
+    ) -> Job | None:
+        if is_admin:
+            return await db_async.fetch_one(GET_JOB_ADMIN_STMT, (job_id,), Job)
+        return await db_async.fetch_one(GET_JOB_STMT, (groups, job_id), Job)
 
     def list_tasks(self, job_id: int) -> list[Task]:
         return fetch_all(
@@ -231,3 +243,32 @@ class JobsRepo:
             """,
             (job_id, task_id, created_at, task_name, task_desc),
         )
+
+    def create_tasks(self, tasks: list[Task]) -> None:
+        if not tasks:
+            return
+
+        placeholders = ", ".join(["(%s, %s, %s, %s, %s)"] * len(tasks))
+        execute_stmt(
+            DynamicStmt(f"""
+                INSERT INTO tasks
+                    (job_id, task_id, created_at, task_name, task_desc)
+                VALUES {placeholders}
+                ON CONFLICT (job_id, task_id) DO NOTHING
+                """),
+            tuple(
+                value
+                for task in tasks
+                for value in (
+                    task.job_id,
+                    task.task_id,
+                    task.created_at,
+                    task.task_name,
+                    task.task_desc,
+                )
+            ),
+            operation="jobs.create_tasks",
+            # rows of a batch that committed before a connection error are
+            # skipped on the retry
+            idempotent=True,
+        )
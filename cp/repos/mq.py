@@ -1,7 +1,41 @@
 """Message queue repository."""
 
-from ..infra.db import execute_stmt, fetch_one
-from ..models import CommandModel, CommandType, JobID, JobState
+from ..infra.db import execute_stmt, fetch_all, fetch_one
+from ..infra.wakeup import queue_wakeup
+from ..models import (
+    CommandModel,
+    CommandType,
+    IntID,
+    JobID,
+    JobState,
+    MqPriority,
+    Msg,
+)
+
+# Lane of each message type. Types not listed run in the background lane.
+COMMAND_PRIORITIES: dict[CommandType, MqPriority] = {
+    CommandType.CREATE_CLUSTER: MqPriority.INTERACTIVE,
+    CommandType.RECREATE_CLUSTER: MqPriority.INTERACTIVE,
+    CommandType.DELETE_CLUSTER: MqPriority.INTERACTIVE,
+    CommandType.SCALE_CLUSTER: MqPriority.INTERACTIVE,
+    CommandType.UPGRADE_CLUSTER: MqPriority.INTERACTIVE,
+    CommandType.DEBUG_CLUSTER: MqPriority.INTERACTIVE,
+    CommandType.RESTORE_CLUSTER: MqPriority.INTERACTIVE,
+    CommandType.RESTORE_CLUSTER_OBJECT: MqPriority.INTERACTIVE,
+    CommandType.RESTORE_FULL_CLUSTER: MqPriority.INTERACTIVE,
+    CommandType.POLL_CLUSTER_RESTORE: MqPriority.FOLLOW_UP,
+}
+
+# Relative share of each claimed batch when every lane has ready messages.
+LANE_WEIGHTS: dict[MqPriority, int] = {
+    MqPriority.INTERACTIVE: 8,
+    MqPriority.FOLLOW_UP: 4,
+    MqPriority.BACKGROUND: 1,
+}
+
+
+def command_priority(command_type: CommandType) -> MqPriority:
+    return COMMAND_PRIORITIES.get(command_type, MqPriority.BACKGROUND)
 
 
 class MqRepo:
@@ -11,14 +45,14 @@ class MqRepo:
         payload: CommandModel,
         created_by: str,
     ) -> JobID:
-        return fetch_one(
+        job_id = fetch_one(
             """
             WITH
             create_new_job AS (
                 INSERT INTO mq
-                    (msg_type, msg_data, created_by)
+                    (msg_type, msg_data, created_by, priority)
                 VALUES
-                    (%s, %s, %s)
+                    (%s, %s, %s, %s)
                 RETURNING msg_id
             )
             INSERT INTO jobs (job_id, job_type, status, description, created_by)
@@ -29,6 +63,7 @@ class MqRepo:
                 command_type.value,
                 payload.model_dump(),
                 created_by,
+                command_priority(command_type).value,
                 command_type.value,
                 JobState.QUEUED.value,
                 payload.model_dump(),
@@ -37,6 +72,8 @@ class MqRepo:
             JobID,
             operation="mq.enqueue_command",
         )
+        queue_wakeup.notify()
+        return job_id
 
     def enqueue_message(
         self,
@@ -49,15 +86,245 @@ class MqRepo:
         execute_stmt(
             """
             INSERT INTO mq
-                (msg_type, msg_data, created_by, start_after)
+                (msg_type, msg_data, created_by, priority, start_after)
             VALUES
-                (%s, %s, %s, now() + (%s * INTERVAL '1s'))
+                (%s, %s, %s, %s, now() + (%s * INTERVAL '1s'))
             """,
             (
                 command_type.value,
                 payload.model_dump(),
                 created_by,
+                command_priority(command_type).value,
                 start_after_seconds,
             ),
             operation="mq.enqueue_message",
         )
+        if start_after_seconds <= 0:
+            queue_wakeup.notify()
+
+    def claim_messages(
+        self,
+        limit: int,
+        *,
+        lease_owner: str,
+        lease_seconds: int,
+        type_limits: dict[CommandType, int] | None = None,
+        non_interactive_limit: int | None = None,
+        type_kinds: dict[CommandType, str] | None = None,
+        kind_limits: dict[str, int] | None = None,
+    ) -> list[Msg]:
+        """Lease up to ``limit`` ready messages to ``lease_owner``.
+
+        Messages whose lease expired without an ack are claimable again;
+        ``attempts`` counts how often a message has been leased.
+        Each priority lane contributes up to ``limit`` candidates, which are
+        then interleaved by weighted round robin: the n-th oldest message of a
+        type scores ``n / lane weight``, so interactive work is never stuck
+        behind a burst of background messages and no single type starves the
+        others in its lane.
+
+        ``type_limits`` caps how many messages of a type one claim may lease;
+        types with no capacity left are not considered at all.
+        ``non_interactive_limit`` caps the follow-up and background messages of
+        the claim, leaving the remaining slots to interactive work.
+        ``kind_limits`` caps the messages of all types that ``type_kinds`` maps
+        to the same kind, e.g. the types sharing a remote worker kind.
+        """
+        if non_interactive_limit is None:
+            non_interactive_limit = limit
+        type_limits = type_limits or {}
+        type_kinds = type_kinds or {}
+        kind_limits = kind_limits or {}
+        excluded = [
+            command_type.value
+            for command_type, capacity in type_limits.items()
+            if capacity <= 0
+        ]
+        excluded.extend(
+            command_type.value
+            for command_type, kind in type_kinds.items()
+            if kind_limits.get(kind, 1) <= 0
+        )
+        limited_types = [command_type.value for command_type in type_limits]
+        type_caps = list(type_limits.values())
+        kind_types = [
+            command_type.value
+            for command_type, kind in type_kinds.items()
+            if kind in kind_limits
+        ]
+        kind_names = [kind for kind in type_kinds.values() if kind in kind_limits]
+        kind_caps = [kind_limits[kind] for kind in kind_names]
+        lane_stmt = """
+                    (
+                        SELECT msg_id, msg_type, priority, start_after
+                        FROM mq
+                        WHERE priority = %s
+                            AND now() > start_after
+                            AND (leased_until IS NULL OR leased_until < now())
+                            AND msg_type <> ALL (%s::STRING[])
+                        ORDER BY start_after
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )"""
+        lane_args: list = []
+        for priority in MqPriority:
+            lane_args.extend([priority.value, excluded, limit])
+        lanes = " UNION ALL ".join([lane_stmt] * len(MqPriority))
+
+        return fetch_all(
+            f"""
+            UPDATE mq
+            SET leased_until = now() + (%s * INTERVAL '1s'),
+                lease_owner = %s,
+                attempts = attempts + 1
+            WHERE msg_id IN (
+                SELECT msg_id
+                FROM (
+                    SELECT
+                        msg_id,
+                        priority,
+                        start_after,
+                        score,
+                        row_number() OVER (
+                            PARTITION BY priority = %s ORDER BY score, start_after
+                        ) AS lane_rank
+                    FROM (
+                        SELECT
+                            msg_id,
+                            msg_type,
+                            priority,
+                            start_after,
+                            type_rank,
+                            kind_rank,
+                            type_rank::FLOAT8 / (%s::INT8[])[priority + 1] AS score
+                        FROM (
+                            SELECT
+                                candidates.*,
+                                row_number() OVER (
+                                    PARTITION BY msg_type ORDER BY start_after
+                                ) AS type_rank,
+                                row_number() OVER (
+                                    PARTITION BY (%s::STRING[])[
+                                        array_position(%s::STRING[], msg_type)
+                                    ]
+                                    ORDER BY start_after
+                                ) AS kind_rank
+                            FROM ({lanes}
+                            ) AS candidates
+                        ) AS numbered
+                    ) AS ranked
+                    WHERE type_rank <= COALESCE(
+                        (%s::INT8[])[array_position(%s::STRING[], msg_type)],
+                        %s
+                    )
+                    AND kind_rank <= COALESCE(
+                        (%s::INT8[])[array_position(%s::STRING[], msg_type)],
+                        kind_rank
+                    )
+                ) AS admitted
+                WHERE priority = %s OR lane_rank <= %s
+                ORDER BY score, start_after
+                LIMIT %s
+            )
+            RETURNING *
+            """,
+            (
+                lease_seconds,
+                lease_owner,
+                MqPriority.INTERACTIVE.value,
+                [LANE_WEIGHTS[priority] for priority in MqPriority],
+                kind_names,
+                kind_types,
+                *lane_args,
+                type_caps,
+                limited_types,
+                limit,
+                kind_caps,
+                kind_types,
+                MqPriority.INTERACTIVE.value,
+                non_interactive_limit,
+                limit,
+            ),
+            Msg,
+            operation="mq.claim_messages",
+        )
+
+    def extend_leases(
+        self,
+        msg_ids: list[int],
+        *,
+        lease_owner: str,
+        lease_seconds: int,
+    ) -> list[int]:
+        """Heartbeat the leases held by ``lease_owner`` and return the ones still held."""
+        rows = fetch_all(
+            """
+            UPDATE mq
+            SET leased_until = now() + (%s * INTERVAL '1s')
+            WHERE msg_id = ANY (%s::INT8[])
+                AND lease_owner = %s
+            RETURNING msg_id AS id
+            """,
+            (lease_seconds, msg_ids, lease_owner),
+            IntID,
+            operation="mq.extend_leases",
+            idempotent=True,
+        )
+        return [row.id for row in rows]
+
+    def ack_message(self, msg_id: int, *, lease_owner: str) -> None:
+        execute_stmt(
+            """
+            DELETE FROM mq
+            WHERE msg_id = %s
+                AND lease_owner = %s
+            """,
+            (msg_id, lease_owner),
+            operation="mq.ack_message",
+            idempotent=True,
+        )
+
+    def ack_and_enqueue_message(
+        self,
+        msg_id: int,
+        command_type: CommandType,
+        payload: CommandModel,
+        created_by: str,
+        *,
+        lease_owner: str,
+        start_after_seconds: int = 0,
+    ) -> None:
+        """Acknowledge a message and enqueue its successor in one statement.
+
+        The successor is only inserted if the ack deleted the message, so a
+        message redelivered after a lost lease cannot fork the chain and a
+        failed insert leaves the message to be redelivered.
+        """
+        execute_stmt(
+            """
+            WITH
+            acked AS (
+                DELETE FROM mq
+                WHERE msg_id = %s
+                    AND lease_owner = %s
+                RETURNING msg_id
+            )
+            INSERT INTO mq
+                (msg_type, msg_data, created_by, priority, start_after)
+            SELECT %s, %s, %s, %s, now() + (%s * INTERVAL '1s')
+            FROM acked
+            """,
+            (
+                msg_id,
+                lease_owner,
+                command_type.value,
+                payload.model_dump(),
+                created_by,
+                command_priority(command_type).value,
+                start_after_seconds,
+            ),
+            operation="mq.ack_and_enqueue_message",
+            idempotent=True,
+        )
+        if start_after_seconds <= 0:
+            queue_wakeup.notify()
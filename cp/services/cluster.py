@@ -37,6 +37,18 @@ class ClusterService:
                 fallback_message="Unable to load clusters.",
             ) from err
 
+    async def list_visible_clusters_async(
+        self, groups: list[str], is_admin: bool
+    ) -> list:
+        try:
+            return await self.repo.list_clusters_async(groups, is_admin)
+        except RepositoryError as err:
+            raise from_repository_error(
+                err,
+                unavailable_message="Clusters are temporarily unavailable.",
+                fallback_message="Unable to load clusters.",
+            ) from err
+
     def get_visible_cluster_stats(
         self, groups: list[str], is_admin: bool
     ) -> ClusterStatsResponse:
@@ -49,6 +61,18 @@ class ClusterService:
                 fallback_message="Unable to load cluster stats.",
             ) from err
 
+    async def get_visible_cluster_stats_async(
+        self, groups: list[str], is_admin: bool
+    ) -> ClusterStatsResponse:
+        try:
+            return await self.repo.get_cluster_stats_async(groups, is_admin)
+        except RepositoryError as err:
+            raise from_repository_error(
+                err,
+                unavailable_message="Cluster stats are temporarily unavailable.",
+                fallback_message="Unable to load cluster stats.",
+            ) from err
+
     def get_cluster_for_user(
         self,
         cluster_id: str,
@@ -67,6 +91,24 @@ class ClusterService:
                 fallback_message=f"Unable to load cluster '{cluster_id}'.",
             ) from err
 
+    async def get_cluster_for_user_async(
+        self,
+        cluster_id: str,
+        groups: list[str],
+        is_admin: bool,
+    ) -> ClusterPublic | None:
+        try:
+            cluster = await self.repo.get_cluster_async(cluster_id, groups, is_admin)
+            if cluster is None:
+                return None
+            return to_public_cluster(cluster)
+        except RepositoryError as err:
+            raise from_repository_error(
+                err,
+                unavailable_message="Cluster details are temporarily unavailable.",
+                fallback_message=f"Unable to load cluster '{cluster_id}'.",
+            ) from err
+
     def list_cluster_jobs_for_user(
         self,
         cluster_id: str,
@@ -137,6 +137,8 @@ class ClusterUsersService:
                     err, "cluster_database_objects.create_database"
                 ) from err
 
+            # the database exists on the cluster now, so record it even if
+            # role materialization fails below
             self.repo.upsert_cluster_database_object(
                 selected_cluster.cluster_id,
                 normalized_database_name,
@@ -545,23 +547,24 @@ class ClusterUsersService:
 
         normalized_group_names = self._normalized_idp_groups(group_names)
         try:
-            if (
-                self.repo.get_cluster_database_role(
+            with self.repo.transaction():
+                if (
+                    self.repo.get_cluster_database_role(
+                        selected_cluster.cluster_id,
+                        normalized_database_role,
+                    )
+                    is None
+                ):
+                    raise ServiceValidationError(
+                        f"Database role '{normalized_database_role}' is not configured for this cluster."
+                    )
+
+                self.repo.replace_cluster_database_role_groups(
                     selected_cluster.cluster_id,
                     normalized_database_role,
+                    normalized_group_names,
+                    requested_by,
                 )
-                is None
-            ):
-                raise ServiceValidationError(
-                    f"Database role '{normalized_database_role}' is not configured for this cluster."
-                )
-
-            self.repo.replace_cluster_database_role_groups(
-                selected_cluster.cluster_id,
-                normalized_database_role,
-                normalized_group_names,
-                requested_by,
-            )
             log_event(
                 self.repo,
                 requested_by,
@@ -608,24 +611,23 @@ class ClusterUsersService:
         selected_cluster: Cluster,
         requested_by: str,
     ) -> int:
-        """Create/drop generated database roles so CP metadata matches the cluster."""
+        """Create/drop generated database roles so CP metadata matches the cluster.
+
+        The cluster DDL runs first, outside any CP transaction; the metadata
+        rows it produced are then written in one retryable transaction.
+        """
         try:
             templates = self.repo.list_database_role_templates()
             if not templates:
                 return 0
 
-            synced = 0
-            desired_database_roles = []
+            databases: list[str] = []
+            database_roles: list[ClusterDatabaseRole] = []
             try:
                 with connect_to_cluster_db(selected_cluster) as conn:
                     with conn.cursor() as cur:
                         databases = self._list_user_databases(cur)
                         for database_name in databases:
-                            self.repo.upsert_cluster_database_object(
-                                selected_cluster.cluster_id,
-                                database_name,
-                                requested_by,
-                            )
                             schemas = self._list_user_schemas(cur, database_name)
                             for template in templates:
                                 targets = self._targets_for_template(
@@ -634,7 +636,6 @@ class ClusterUsersService:
                                     template,
                                 )
                                 for schema_name, database_role in targets:
-                                    desired_database_roles.append(database_role)
                                     stmt = sql.SQL(template.sql_statement).format(
                                         database_role=sql.Identifier(database_role),
                                         role=sql.Identifier(database_role),
@@ -648,7 +649,7 @@ class ClusterUsersService:
                                         else sql.SQL(""),
                                     )
                                     cur.execute(stmt)
-                                    self.repo.upsert_cluster_database_role(
+                                    database_roles.append(
                                         ClusterDatabaseRole(
                                             cluster_id=selected_cluster.cluster_id,
                                             database_name=database_name,
@@ -659,13 +660,6 @@ class ClusterUsersService:
                                             sql_statement=stmt.as_string(conn),
                                         )
                                     )
-                                    synced += 1
-                        self.repo.delete_stale_cluster_database_roles(
-                            selected_cluster.cluster_id,
-                            desired_database_roles,
-                        )
-            except RepositoryError:
-                raise
             except Exception as err:
                 logger.debug(
                     "Cluster role materialization failed [operation=cluster_users.materialize_cluster_database_roles]"
@@ -674,7 +668,26 @@ class ClusterUsersService:
                     err, "cluster_users.materialize_cluster_database_roles"
                 ) from err
 
-            return synced
+            def write_metadata() -> None:
+                for database_name in databases:
+                    self.repo.upsert_cluster_database_object(
+                        selected_cluster.cluster_id,
+                        database_name,
+                        requested_by,
+                    )
+                for database_role in database_roles:
+                    self.repo.upsert_cluster_database_role(database_role)
+                self.repo.delete_stale_cluster_database_roles(
+                    selected_cluster.cluster_id,
+                    [role.database_role for role in database_roles],
+                )
+
+            self.repo.run_transaction(
+                write_metadata,
+                operation="cluster_users.materialize_cluster_database_roles",
+                idempotent=True,
+            )
+            return len(database_roles)
         except RepositoryError as err:
             raise from_repository_error(
                 err,
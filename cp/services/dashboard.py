@@ -1,20 +1,153 @@
 """Business logic for the cluster dashboard vertical."""
 
 import logging
+import math
 import time
-from typing import Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from ..infra.cache import TTLCache
 from ..infra.db import get_repo
 from ..infra.errors import RepositoryError, RepositoryUnavailableError
-from ..models import DashboardMetrics, DashboardSnapshot, SettingKey, to_public_cluster
+from ..models import (
+    DashboardChartColumns,
+    DashboardMetrics,
+    DashboardSnapshot,
+    FleetMetrics,
+    SettingKey,
+    to_public_cluster,
+)
 from ..repos import Repo
 from .errors import ServiceValidationError, from_repository_error
 
 PROMETHEUS_TIMEOUT_SECS = 10
+PROMETHEUS_MAX_CONNECTIONS = 32
+DASHBOARD_CACHE_TTL_SECS = 10
+DASHBOARD_CACHE_MAX_ENTRIES = 2048
+# Points per series a chart can usefully draw; wider windows get a coarser
+# step so payload and render cost stay flat.
+DASHBOARD_MAX_POINTS = 500
+FLEET_MAX_POINTS = 120
+# Prometheus rejects range queries resolving to more points than this.
+PROMETHEUS_MAX_POINTS = 11000
+# Points per series fetched for each point a downsampler keeps.
+DOWNSAMPLE_FETCH_FACTOR = 10
+# Steps the adaptive step is rounded up to, so viewers of similar windows
+# share cache entries.
+DASHBOARD_STEPS_SECS = (
+    10,
+    15,
+    30,
+    60,
+    120,
+    300,
+    600,
+    900,
+    1800,
+    3600,
+    7200,
+    21600,
+    43200,
+    86400,
+)
 logger = logging.getLogger(__name__)
 
+# Shared by every dashboard request so Prometheus connections are kept alive
+# and the range queries of one dashboard run concurrently.
+_prometheus_session = requests.Session()
+_prometheus_session.mount(
+    "http://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=PROMETHEUS_MAX_CONNECTIONS,
+    ),
+)
+_prometheus_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=PROMETHEUS_MAX_CONNECTIONS,
+    ),
+)
+_prometheus_executor = ThreadPoolExecutor(
+    max_workers=PROMETHEUS_MAX_CONNECTIONS,
+    thread_name_prefix="prometheus",
+)
+# Range query results keyed on the step-aligned window, shared by every
+# viewer of the same cluster.
+_prometheus_cache = TTLCache(
+    max_entries=DASHBOARD_CACHE_MAX_ENTRIES,
+    ttl=DASHBOARD_CACHE_TTL_SECS,
+)
+
+
+def _dashboard_queries(
+    cluster_id: str,
+) -> list[tuple[str, str, Callable[[Any], float], bool]]:
+    return [
+        (
+            "latency",
+            f'histogram_quantile(0.99, rate(sql_service_latency_bucket{{cluster="{cluster_id}"}}[1m])) / 1000 / 1000',
+            lambda value: round(float(value), 2),
+            True,
+        ),
+        (
+            "cpu",
+            f'sys_cpu_user_percent{{cluster="{cluster_id}"}}',
+            lambda value: round(float(value) * 100, 2),
+            True,
+        ),
+        (
+            "selects",
+            f'sum(rate(sql_select_count{{cluster="{cluster_id}"}}[1m]))',
+            lambda value: round(float(value), 2),
+            False,
+        ),
+        (
+            "inserts",
+            f'sum(rate(sql_insert_count{{cluster="{cluster_id}"}}[1m]))',
+            lambda value: round(float(value), 2),
+            False,
+        ),
+        (
+            "updates",
+            f'sum(rate(sql_update_count{{cluster="{cluster_id}"}}[1m]))',
+            lambda value: round(float(value), 2),
+            False,
+        ),
+        (
+            "deletes",
+            f'sum(rate(sql_delete_count{{cluster="{cluster_id}"}}[1m]))',
+            lambda value: round(float(value), 2),
+            False,
+        ),
+    ]
+
+
+# One query per metric for the whole fleet, split per cluster in-process.
+FLEET_QUERIES: list[tuple[str, str, Callable[[Any], float]]] = [
+    (
+        "qps",
+        "sum by (cluster) (rate(sql_select_count[1m]) + rate(sql_insert_count[1m])"
+        " + rate(sql_update_count[1m]) + rate(sql_delete_count[1m]))",
+        lambda value: round(float(value), 2),
+    ),
+    (
+        "cpu",
+        "avg by (cluster) (sys_cpu_user_percent)",
+        lambda value: round(float(value) * 100, 2),
+    ),
+    (
+        "p99",
+        "histogram_quantile(0.99, sum by (cluster, le) "
+        "(rate(sql_service_latency_bucket[1m]))) / 1000 / 1000",
+        lambda value: round(float(value), 2),
+    ),
+]
+
 
 class DashboardService:
     def __init__(self, repo: Repo | None = None) -> None:
@@ -36,6 +169,10 @@ class DashboardService:
         start: int,
         end: int,
         interval_secs: int,
+        *,
+        columnar: bool = False,
+        max_points: int = DASHBOARD_MAX_POINTS,
+        downsample: str | None = None,
     ) -> DashboardSnapshot | None:
         selected_cluster = self.repo.get_cluster(cluster_id, groups, is_admin)
         if selected_cluster is None:
@@ -47,6 +184,9 @@ class DashboardService:
             start,
             end,
             interval_secs,
+            columnar=columnar,
+            max_points=max_points,
+            downsample=downsample,
         )
         return DashboardSnapshot(
             cluster=to_public_cluster(selected_cluster),
@@ -60,57 +200,58 @@ class DashboardService:
         start: int,
         end: int,
         interval_secs: int,
+        *,
+        columnar: bool = False,
+        max_points: int = DASHBOARD_MAX_POINTS,
+        downsample: str | None = None,
     ) -> DashboardMetrics:
-        effective_start = start if start > 0 else end
-        current_nodes: set[int] = set()
-        series: dict[str, dict[int, float]] = {}
+        """Load the dashboard series of ``cluster_id``.
 
-        for metric_name, query, transform, track_nodes in [
-            (
-                "latency",
-                f'histogram_quantile(0.99, rate(sql_service_latency_bucket{{cluster="{cluster_id}"}}[1m])) / 1000 / 1000',
-                lambda value: round(float(value), 2),
-                True,
-            ),
-            (
-                "cpu",
-                f'sys_cpu_user_percent{{cluster="{cluster_id}"}}',
-                lambda value: round(float(value) * 100, 2),
-                True,
-            ),
-            (
-                "selects",
-                f'sum(rate(sql_select_count{{cluster="{cluster_id}"}}[1m]))',
-                lambda value: round(float(value), 2),
-                False,
-            ),
-            (
-                "inserts",
-                f'sum(rate(sql_insert_count{{cluster="{cluster_id}"}}[1m]))',
-                lambda value: round(float(value), 2),
-                False,
-            ),
-            (
-                "updates",
-                f'sum(rate(sql_update_count{{cluster="{cluster_id}"}}[1m]))',
-                lambda value: round(float(value), 2),
-                False,
-            ),
+        Without ``downsample`` the step is widened so no series exceeds
+        ``max_points``. With ``downsample`` ("lttb" or "minmax") the series are
+        fetched at the requested resolution, merged, and reduced to
+        ``max_points`` rows on buckets shared by every series, which keeps
+        short spikes visible. The fetch resolution is capped at
+        ``DOWNSAMPLE_FETCH_FACTOR`` points per kept point.
+        """
+        if downsample is not None and downsample not in DOWNSAMPLERS:
+            raise ServiceValidationError(f"Unknown downsampler '{downsample}'.")
+
+        effective_start = start if start > 0 else end
+        step = self._choose_step(
+            end - effective_start,
+            interval_secs,
             (
-                "deletes",
-                f'sum(rate(sql_delete_count{{cluster="{cluster_id}"}}[1m]))',
-                lambda value: round(float(value), 2),
-                False,
+                min(max_points * DOWNSAMPLE_FETCH_FACTOR, PROMETHEUS_MAX_POINTS)
+                if downsample
+                else max_points
             ),
-        ]:
+        )
+        # align the window on the step grid so concurrent viewers share the
+        # same upstream query and cache entry
+        aligned_start = effective_start - effective_start % step
+        aligned_end = end - end % step
+        current_nodes: set[int] = set()
+        series: dict[str, list[tuple[float, float]]] = {}
+
+        queries = _dashboard_queries(cluster_id)
+        futures = [
+            self._submit_range_query(
+                prom_url,
+                (cluster_id, metric_name),
+                query,
+                aligned_start,
+                aligned_end,
+                step,
+            )
+            for metric_name, query, _transform, _track_nodes in queries
+        ]
+
+        for (metric_name, _query, transform, track_nodes), future in zip(
+            queries, futures
+        ):
             try:
-                response = self._query_prometheus_range(
-                    prom_url,
-                    query=query,
-                    start=effective_start,
-                    end=end,
-                    interval_secs=interval_secs,
-                )
+                response = future.result()
             except RepositoryError as err:
                 raise from_repository_error(
                     err,
@@ -123,17 +264,120 @@ class DashboardService:
                 for item in response["data"]["result"]:
                     node_id = int(item["metric"]["node_id"])
                     current_nodes.add(node_id)
-                    series[f"{prefix}_n{node_id}"] = {
-                        ts: transform(value) for ts, value in item["values"]
-                    }
+                    series[f"{prefix}_n{node_id}"] = [
+                        (ts, transform(value)) for ts, value in item["values"]
+                    ]
                 continue
 
             values = self._first_result_values(response)
-            series[metric_name[0]] = {ts: transform(value) for ts, value in values}
+            series[metric_name[0]] = [(ts, transform(value)) for ts, value in values]
 
+        columns = self._merge_on_grid(series, aligned_start, aligned_end, step)
+        if downsample is not None:
+            columns = DOWNSAMPLERS[downsample](columns, max_points)
+        if "t" in columns.series:
+            # rows without any query counts report a zero total, as before
+            columns.series["t"] = [
+                0.0 if value is None else value for value in columns.series["t"]
+            ]
+        if columnar:
+            return DashboardMetrics(
+                current_nodes=sorted(current_nodes),
+                chart_columns=columns,
+            )
         return DashboardMetrics(
             current_nodes=sorted(current_nodes),
-            chart_data=self._merge_by_ts(series),
+            chart_data=self._columns_to_rows(columns),
+        )
+
+    def load_fleet_metrics(
+        self,
+        groups: list[str],
+        is_admin: bool,
+        start: int,
+        end: int,
+        interval_secs: int,
+        *,
+        max_points: int = FLEET_MAX_POINTS,
+    ) -> FleetMetrics:
+        """Load sparkline series of every cluster visible to the caller.
+
+        Each metric is a single ``by (cluster)`` query shared by all callers
+        through the cache; results are filtered to the visible clusters.
+        """
+        visible = {
+            cluster.cluster_id for cluster in self.repo.list_clusters(groups, is_admin)
+        }
+        prom_url = self.get_prometheus_url()
+
+        effective_start = start if start > 0 else end
+        step = self._choose_step(end - effective_start, interval_secs, max_points)
+        aligned_start = effective_start - effective_start % step
+        aligned_end = end - end % step
+
+        futures = [
+            self._submit_range_query(
+                prom_url,
+                ("fleet", metric_name),
+                query,
+                aligned_start,
+                aligned_end,
+                step,
+            )
+            for metric_name, query, _transform in FLEET_QUERIES
+        ]
+
+        series_by_cluster: dict[str, dict[str, list[tuple[float, float]]]] = {}
+        for (metric_name, _query, transform), future in zip(FLEET_QUERIES, futures):
+            try:
+                response = future.result()
+            except RepositoryError as err:
+                raise from_repository_error(
+                    err,
+                    unavailable_message="Fleet metrics are temporarily unavailable.",
+                    fallback_message="Unable to load fleet metrics.",
+                ) from err
+
+            for item in response.get("data", {}).get("result", []):
+                cluster_id = item.get("metric", {}).get("cluster")
+                if cluster_id not in visible:
+                    continue
+                series_by_cluster.setdefault(cluster_id, {})[metric_name] = [
+                    (ts, transform(value)) for ts, value in item.get("values", [])
+                ]
+
+        return FleetMetrics(
+            metrics=[metric_name for metric_name, _query, _transform in FLEET_QUERIES],
+            clusters={
+                cluster_id: self._merge_on_grid(
+                    series,
+                    aligned_start,
+                    aligned_end,
+                    step,
+                )
+                for cluster_id, series in sorted(series_by_cluster.items())
+            },
+        )
+
+    def _submit_range_query(
+        self,
+        prom_url: str,
+        key: tuple,
+        query: str,
+        start: int,
+        end: int,
+        step: int,
+    ) -> Future:
+        return _prometheus_executor.submit(
+            _prometheus_cache.get_or_load,
+            (prom_url, *key, start, end, step),
+            lambda: self._query_prometheus_range(
+                prom_url,
+                query=query,
+                start=start,
+                end=end,
+                interval_secs=step,
+            ),
         )
 
     def _query_prometheus_range(
@@ -146,7 +390,7 @@ class DashboardService:
         interval_secs: int,
     ) -> dict[str, Any]:
         try:
-            response = requests.get(
+            response = _prometheus_session.get(
                 prom_url,
                 params={
                     "query": query,
@@ -176,6 +420,14 @@ class DashboardService:
                 operation="dashboard.query_prometheus_range",
             ) from err
 
+    @staticmethod
+    def _choose_step(window_secs: int, interval_secs: int, max_points: int) -> int:
+        step = max(interval_secs, 1)
+        needed = math.ceil(window_secs / max(max_points, 1))
+        if needed <= step:
+            return step
+        return next((s for s in DASHBOARD_STEPS_SECS if s >= needed), needed)
+
     @staticmethod
     def _first_result_values(response: dict[str, Any]) -> list[list[str | float]]:
         result = response.get("data", {}).get("result", [])
@@ -184,26 +436,170 @@ class DashboardService:
         return result[0].get("values", [])
 
     @staticmethod
-    def _merge_by_ts(named_series: dict[str, dict[int, float]]) -> list[dict[str, Any]]:
-        if not named_series:
-            return []
+    def _merge_on_grid(
+        named_series: dict[str, list[tuple[float, float]]],
+        start: int,
+        end: int,
+        step: int,
+    ) -> DashboardChartColumns:
+        """Place every series on the shared ``start..end`` step grid.
+
+        All range queries use the same aligned window and step, so a sample's
+        grid slot is computed from its timestamp instead of matched against
+        the union of all timestamps. Slots without any sample are dropped.
+        """
+        size = max((end - start) // step + 1, 0) if named_series else 0
+        has_sample = [False] * size
+        columns: dict[str, list[float | None]] = {}
+
+        for name, points in named_series.items():
+            column: list[float | None] = [None] * size
+            for ts, value in points:
+                idx = round((float(ts) - start) / step)
+                if 0 <= idx < size:
+                    column[idx] = value
+                    has_sample[idx] = True
+            columns[name] = column
+
+        kept = [idx for idx, sampled in enumerate(has_sample) if sampled]
+        if len(kept) < size:
+            columns = {
+                name: [column[idx] for idx in kept] for name, column in columns.items()
+            }
+
+        totals: list[float | None] = [None] * len(kept)
+        for name in ("s", "i", "u", "d"):
+            for idx, value in enumerate(columns.get(name, ())):
+                if value is not None:
+                    totals[idx] = (totals[idx] or 0.0) + value
+        if kept:
+            columns["t"] = totals
 
-        all_ts = sorted(
-            set(ts for series in named_series.values() for ts in series.keys())
+        return DashboardChartColumns(
+            ts=[start + idx * step for idx in kept],
+            series=columns,
         )
 
+    @staticmethod
+    def _columns_to_rows(columns: DashboardChartColumns) -> list[dict[str, Any]]:
         rows = []
-        for ts in all_ts:
+        for idx, ts in enumerate(columns.ts):
             row: dict[str, Any] = {
                 "ts": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(ts))
             }
-            for name, series in named_series.items():
-                if ts in series:
-                    row[name] = series[ts]
-
-            row["t"] = (
-                row.get("s", 0) + row.get("i", 0) + row.get("u", 0) + row.get("d", 0)
-            )
+            for name, column in columns.series.items():
+                if column[idx] is not None:
+                    row[name] = column[idx]
             rows.append(row)
 
         return rows
+
+
+def _bucket_bounds(start: int, stop: int, count: int) -> list[tuple[int, int]]:
+    """Split the row range ``start..stop`` into ``count`` contiguous buckets."""
+    width = (stop - start) / count
+    return [
+        (start + int(bucket * width), start + int((bucket + 1) * width))
+        for bucket in range(count)
+    ]
+
+
+def _present(column: list[float | None], start: int, stop: int) -> list[int]:
+    return [idx for idx in range(start, stop) if column[idx] is not None]
+
+
+def lttb(columns: DashboardChartColumns, threshold: int) -> DashboardChartColumns:
+    """Largest-Triangle-Three-Buckets downsampling to at most ``threshold`` rows.
+
+    Keeps the visual shape of each series, including peaks, much better than
+    picking every n-th row. All series share the same buckets, so every output
+    row carries a value for each series that has samples in its bucket; the
+    row is stamped with the middle of the bucket.
+    """
+    ts = columns.ts
+    size = len(ts)
+    if threshold >= size or threshold < 3:
+        return columns
+
+    buckets = _bucket_bounds(1, size - 1, threshold - 2)
+    sampled: dict[str, list[float | None]] = {}
+    for name, column in columns.series.items():
+        values = [column[0]]
+        prev = 0 if column[0] is not None else None
+        for bucket, (start, end) in enumerate(buckets):
+            candidates = _present(column, start, end)
+            if not candidates:
+                values.append(None)
+                continue
+
+            next_start, next_end = (
+                buckets[bucket + 1] if bucket + 1 < len(buckets) else (size - 1, size)
+            )
+            next_points = _present(column, next_start, next_end)
+            best_idx = candidates[0]
+            if prev is not None and next_points:
+                avg_ts = sum(ts[idx] for idx in next_points) / len(next_points)
+                avg_value = sum(column[idx] for idx in next_points) / len(next_points)
+                prev_ts, prev_value = ts[prev], column[prev]
+                best_area = -1.0
+                for idx in candidates:
+                    area = abs(
+                        (prev_ts - avg_ts) * (column[idx] - prev_value)
+                        - (prev_ts - ts[idx]) * (avg_value - prev_value)
+                    )
+                    if area > best_area:
+                        best_idx, best_area = idx, area
+
+            values.append(column[best_idx])
+            prev = best_idx
+        values.append(column[-1])
+        sampled[name] = values
+
+    return DashboardChartColumns(
+        ts=[ts[0], *(ts[(start + end - 1) // 2] for start, end in buckets), ts[-1]],
+        series=sampled,
+    )
+
+
+def min_max(columns: DashboardChartColumns, threshold: int) -> DashboardChartColumns:
+    """Keep the minimum and maximum of ``threshold // 2`` shared buckets, in time order.
+
+    Each bucket becomes two rows, stamped with the start and the middle of the
+    bucket, holding every series' earlier and later extreme.
+    """
+    ts = columns.ts
+    size = len(ts)
+    bucket_count = threshold // 2
+    if threshold >= size or bucket_count < 1:
+        return columns
+
+    buckets = _bucket_bounds(0, size, bucket_count)
+    sampled: dict[str, list[float | None]] = {}
+    for name, column in columns.series.items():
+        values: list[float | None] = []
+        for start, end in buckets:
+            candidates = _present(column, start, end)
+            if not candidates:
+                values.extend((None, None))
+                continue
+            low = min(candidates, key=lambda idx: column[idx])
+            high = max(candidates, key=lambda idx: column[idx])
+            values.extend((column[min(low, high)], column[max(low, high)]))
+        sampled[name] = values
+
+    return DashboardChartColumns(
+        ts=[
+            stamp
+            for start, end in buckets
+            for stamp in (ts[start], ts[start + (end - start) // 2])
+        ],
+        series=sampled,
+    )
+
+
+DOWNSAMPLERS: dict[
+    str, Callable[[DashboardChartColumns, int], DashboardChartColumns]
+] = {
+    "lttb": lttb,
+    "minmax": min_max,
+}
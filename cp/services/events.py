@@ -27,6 +27,22 @@ class EventsService:
                 fallback_message="Unable to load EventRepo.",
             ) from err
 
+    async def list_visible_events_async(
+        self,
+        limit: int,
+        offset: int,
+        groups: list[str],
+        is_admin: bool,
+    ) -> list[LogMsg]:
+        try:
+            return await self.repo.list_events_async(limit, offset, groups, is_admin)
+        except RepositoryError as err:
+            raise from_repository_error(
+                err,
+                unavailable_message="Events are temporarily unavailable.",
+                fallback_message="Unable to load EventRepo.",
+            ) from err
+
     def get_event_total(self) -> int:
         try:
             return self.repo.get_event_count()
@@ -36,3 +52,13 @@ class EventsService:
                 unavailable_message="Event totals are temporarily unavailable.",
                 fallback_message="Unable to load the event count.",
             ) from err
+
+    async def get_event_total_async(self) -> int:
+        try:
+            return await self.repo.get_event_count_async()
+        except RepositoryError as err:
+            raise from_repository_error(
+                err,
+                unavailable_message="Event totals are temporarily unavailable.",
+                fallback_message="Unable to load the event count.",
+            ) from err
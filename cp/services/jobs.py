@@ -31,6 +31,18 @@ class JobsService:
                 fallback_message="Unable to load JobsRepo.",
             ) from err
 
+    async def list_visible_jobs_async(
+        self, groups: list[str], is_admin: bool
+    ) -> list[Job]:
+        try:
+            return await self.repo.list_jobs_async(groups, is_admin)
+        except RepositoryError as err:
+            raise from_repository_error(
+                err,
+                unavailable_message="Jobs are temporarily unavailable.",
+                fallback_message="Unable to load JobsRepo.",
+            ) from err
+
     def get_visible_job_stats(
         self, groups: list[str], is_admin: bool
     ) -> JobStatsResponse:
@@ -43,6 +55,18 @@ class JobsService:
                 fallback_message="Unable to load job stats.",
             ) from err
 
+    async def get_visible_job_stats_async(
+        self, groups: list[str], is_admin: bool
+    ) -> JobStatsResponse:
+        try:
+            return await self.repo.get_job_stats_async(groups, is_admin)
+        except RepositoryError as err:
+            raise from_repository_error(
+                err,
+                unavailable_message="Job stats are temporarily unavailable.",
+                fallback_message="Unable to load job stats.",
+            ) from err
+
     def get_job_for_user(
         self,
         job_id: int,
@@ -58,6 +82,21 @@ class JobsService:
                 fallback_message=f"Unable to load job '{job_id}'.",
             ) from err
 
+    async def get_job_for_user_async(
+        self,
+        job_id: int,
+        groups: list[str],
+        is_admin: bool,
+    ) -> Job | None:
+        try:
+            return await self.repo.get_job_async(job_id, groups, is_admin)
+        except RepositoryError as err:
+            raise from_repository_error(
+                err,
+                unavailable_message="Job details are temporarily unavailable.",
+                fallback_message=f"Unable to load job '{job_id}'.",
+            ) from err
+
     def get_job_details_for_user(
         self,
         job_id: int,
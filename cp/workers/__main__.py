@@ -0,0 +1,63 @@
+"""Standalone MQ worker process: ``python -m cp.workers``."""
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from .. import DB_ENGINE, DB_URL
+from ..infra import close_db, get_repo, initialize_postgres
+from ..infra.db import WORKER_POOL
+from ..infra.logging import configure_logging
+from .queue import MQ_BATCH_SIZE, MQ_MAX_WORKERS, MqConsumer
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m cp.workers")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=MQ_MAX_WORKERS,
+        help="number of MQ handlers running at the same time",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=MQ_BATCH_SIZE,
+        help="maximum number of messages claimed per poll",
+    )
+    return parser.parse_args(argv)
+
+
+async def run_worker(max_workers: int, batch_size: int) -> None:
+    consumer = MqConsumer(max_workers=max_workers, batch_size=batch_size)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, consumer.stop)
+
+    logger.info(
+        "MQ worker %s started with concurrency %s",
+        consumer.lease_owner,
+        max_workers,
+    )
+    await consumer.run()
+    logger.info("MQ worker %s stopped", consumer.lease_owner)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if DB_ENGINE != "postgres":
+        raise SystemExit("The MQ worker requires a postgres DB_URL.")
+
+    initialize_postgres(DB_URL, pool_names=(WORKER_POOL,))
+    configure_logging(get_repo(), force=True)
+    try:
+        asyncio.run(run_worker(args.concurrency, args.batch_size))
+    finally:
+        close_db()
+
+
+if __name__ == "__main__":
+    main()
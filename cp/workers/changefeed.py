@@ -0,0 +1,74 @@
+"""Cross-replica MQ wakeups driven by a sinkless CockroachDB changefeed."""
+
+import json
+import logging
+import threading
+
+import psycopg
+
+from ..infra.wakeup import QueueWakeup
+
+logger = logging.getLogger(__name__)
+
+CHANGEFEED_RETRY_SECONDS = 10
+
+# rangefeeds must be enabled on the metadata cluster:
+#   SET CLUSTER SETTING kv.rangefeed.enabled = true;
+MQ_CHANGEFEED_STMT = "EXPERIMENTAL CHANGEFEED FOR mq WITH initial_scan = 'no'"
+
+
+class MqChangefeedListener(threading.Thread):
+    """Stream row changes on ``mq`` and wake the consumer when a message is added.
+
+    Lease updates, heartbeats and acks also show up in the feed; only rows
+    without a lease owner represent newly claimable work.
+    """
+
+    def __init__(self, db_url: str, wakeup: QueueWakeup) -> None:
+        super().__init__(name="mq-changefeed", daemon=True)
+        self.db_url = db_url
+        self.wakeup = wakeup
+        self._stopped = threading.Event()
+        self._conn: psycopg.Connection | None = None
+
+    def run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                with psycopg.connect(self.db_url, autocommit=True) as conn:
+                    self._conn = conn
+                    with conn.cursor() as cur:
+                        for _table, _key, value in cur.stream(MQ_CHANGEFEED_STMT):
+                            if self._stopped.is_set():
+                                break
+                            if self._is_new_message(value):
+                                self.wakeup.notify()
+            except Exception:
+                if self._stopped.is_set():
+                    break
+                logger.warning(
+                    "MQ changefeed disconnected, retrying in %ss",
+                    CHANGEFEED_RETRY_SECONDS,
+                    exc_info=True,
+                )
+                self._stopped.wait(CHANGEFEED_RETRY_SECONDS)
+            finally:
+                self._conn = None
+
+    def stop(self) -> None:
+        self._stopped.set()
+        conn = self._conn
+        if conn is not None:
+            try:
+                conn.cancel()
+            except Exception:
+                logger.debug("Unable to cancel the MQ changefeed", exc_info=True)
+
+    @staticmethod
+    def _is_new_message(value: bytes | str | None) -> bool:
+        if value is None:
+            return False
+        try:
+            after = json.loads(value).get("after")
+        except TypeError, ValueError:
+            return True
+        return isinstance(after, dict) and after.get("lease_owner") is None
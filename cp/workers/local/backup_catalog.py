@@ -59,15 +59,19 @@ def sync_cluster_backup_catalog(
         backup_uri = StorageBrokerService(repo).get_backup_external_connection_uri(
             cluster.cluster_id
         )
+        cataloged = {
+            entry.backup_path: entry.status
+            for entry in repo.list_cluster_backup_catalog_paths(cluster.cluster_id)
+        }
         entries = []
         with get_pool().connection() as conn:
             with conn.cursor() as cur:
                 path_rows = cur.execute(
                     sql.SQL("SHOW BACKUPS IN {}").format(sql.Literal(backup_uri))
                 ).fetchall()
+            seen_paths = [str(path_row[0]) for path_row in path_rows]
             with conn.cursor(row_factory=dict_row) as cur:
-                for path_row in path_rows:
-                    backup_path = str(path_row[0])
+                for backup_path in _paths_to_sync(seen_paths, cataloged):
                     detail_rows = cur.execute(
                         sql.SQL("SELECT * FROM [SHOW BACKUP FROM {} IN {}]").format(
                             sql.Literal(backup_path),
@@ -83,7 +87,7 @@ def sync_cluster_backup_catalog(
                         )
                     )
 
-        repo.replace_cluster_backup_catalog(cluster.cluster_id, entries)
+        repo.sync_cluster_backup_catalog(cluster.cluster_id, seen_paths, entries)
     except Exception as err:
         logger.exception(
             "Unable to sync backup catalog for cluster '%s'", cluster.cluster_id
@@ -91,6 +95,21 @@ def sync_cluster_backup_catalog(
         repo.mark_cluster_backup_catalog_unavailable(cluster.cluster_id, str(err))
 
 
+def _paths_to_sync(seen_paths: list[str], cataloged: dict[str, str]) -> list[str]:
+    """Pick the backup paths whose contents have to be read from storage.
+
+    A path is final once cataloged as AVAILABLE, except for the newest one:
+    scheduled incremental backups keep being appended to the latest full
+    backup until the next full backup starts a new path.
+    """
+    latest_path = max(seen_paths, default=None)
+    return [
+        backup_path
+        for backup_path in seen_paths
+        if backup_path == latest_path or cataloged.get(backup_path) != "AVAILABLE"
+    ]
+
+
 def _catalog_entry_from_backup_details(
     cluster_id: str,
     group: str | None,
@@ -1,23 +1,32 @@
 import asyncio
 import datetime as dt
 import logging
+import os
 import random
+import socket
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Callable
 
-from psycopg.rows import class_row
-
-from ..infra import get_repo
-from ..infra.db import get_pool
+from .. import DB_URL
+from ..infra import as_bool, get_repo, use_worker_pool
+from ..infra.wakeup import queue_wakeup
 from ..models import (
     ClusterState,
     CommandModel,
     CommandType,
     FailZombieJobsCommand,
+    HealthcheckClustersCommand,
     JobState,
+    MqPriority,
     Msg,
     Nodes,
     parse_command_payload,
 )
+from ..repos.mq import command_priority
+from .changefeed import MqChangefeedListener
 from .local.backup_catalog import sync_backup_catalog, sync_cluster_backup_catalog
 from .local.restore import (
     poll_cluster_restore,
@@ -29,10 +38,53 @@ from .remote.create import create_cluster
 from .remote.delete import delete_cluster
 from .remote.healthcheck import healthcheck_clusters
 from .remote.scale import scale_cluster
+from .remote.common import remote_workers, wait_for_workers
 from .remote.upgrade import upgrade_cluster
 
 logger = logging.getLogger(__name__)
 
+MQ_MAX_WORKERS = int(os.getenv("MQ_MAX_WORKERS", "8"))
+MQ_BATCH_SIZE = int(os.getenv("MQ_BATCH_SIZE", "16"))
+MQ_CHANGEFEED_WAKEUP = as_bool(os.getenv("MQ_CHANGEFEED_WAKEUP"))
+MQ_IDLE_MIN_SECONDS = 0.5
+# Enqueues wake the consumer directly, so idle polling only has to catch
+# delayed messages coming due and, without the changefeed, enqueues made by
+# other replicas.
+MQ_IDLE_MAX_SECONDS = 30.0 if MQ_CHANGEFEED_WAKEUP else 5.0
+# Worker slots that follow-up and background messages may not occupy, so
+# interactive jobs always find a free handler.
+MQ_INTERACTIVE_RESERVED_SLOTS = int(os.getenv("MQ_INTERACTIVE_RESERVED_SLOTS", "2"))
+MQ_LEASE_SECONDS = 60
+# Deliveries after which a message whose handler never finished (e.g. because
+# it keeps crashing the worker) is failed instead of run again.
+MQ_MAX_ATTEMPTS = int(os.getenv("MQ_MAX_ATTEMPTS", "5"))
+MQ_HEARTBEAT_SECONDS = MQ_LEASE_SECONDS / 3
+MQ_DRAIN_TIMEOUT_SECONDS = float(os.getenv("MQ_DRAIN_TIMEOUT_SECONDS", "600"))
+HEALTHCHECK_INTERVAL_SECONDS = 60
+
+# Upper bound of concurrently running handlers per message type. Types not
+# listed here may use every worker slot.
+COMMAND_CONCURRENCY: dict[CommandType, int] = {
+    CommandType.SYNC_BACKUP_CATALOG: 1,
+    CommandType.SYNC_CLUSTER_BACKUP_CATALOG: 4,
+    CommandType.POLL_CLUSTER_RESTORE: 4,
+    CommandType.HEALTHCHECK_CLUSTERS: 1,
+    CommandType.FAIL_ZOMBIE_JOBS: 1,
+}
+
+# Remote worker kind started by each Ansible-backed handler. A claim never
+# leases more of these messages than the kind has free slots on the shared
+# remote worker pool, so the backlog stays in the MQ, where an idle worker
+# process can pick it up instead.
+REMOTE_WORKER_KINDS: dict[CommandType, str] = {
+    CommandType.CREATE_CLUSTER: "create",
+    CommandType.RECREATE_CLUSTER: "create",
+    CommandType.DELETE_CLUSTER: "delete",
+    CommandType.SCALE_CLUSTER: "scale",
+    CommandType.UPGRADE_CLUSTER: "upgrade",
+    CommandType.HEALTHCHECK_CLUSTERS: "healthcheck",
+}
+
 
 def fail_zombie_jobs(
     _job_id: int,
@@ -89,85 +141,326 @@ def get_nodes():
     ]
 
 
-async def pull_from_mq():
+def process_message(msg: Msg, lease_owner: str) -> None:
+    """Run the handler for a leased MQ message and acknowledge it afterwards."""
+    logger.info(
+        "Processing MQ message %s of type %s",
+        msg.msg_id,
+        msg.msg_type,
+    )
+    repo = get_repo()
+    reschedule = False
+
     try:
+        if msg.attempts > MQ_MAX_ATTEMPTS:
+            raise RuntimeError(
+                f"Giving up after {msg.attempts - 1} deliveries that did not complete."
+            )
+
+        handler = COMMAND_HANDLERS.get(msg.msg_type)
+        if handler is None:
+            raise ValueError(f"Unknown task type requested: {msg.msg_type}")
+
+        command = parse_command_payload(
+            msg.msg_type,
+            msg.msg_data,
+        )
+        handler(msg.msg_id, command, msg.created_by)
+
+        reschedule = msg.msg_type == CommandType.HEALTHCHECK_CLUSTERS
+    except Exception as err:
+        logger.exception(
+            "MQ message %s failed during dispatch",
+            msg.msg_id,
+        )
+        try:
+            repo.update_job(msg.msg_id, JobState.FAILED)
+        except Exception:
+            logger.exception(
+                "Unable to mark job %s as failed",
+                msg.msg_id,
+            )
+        try:
+            repo.create_task(
+                msg.msg_id,
+                0,
+                dt.datetime.now(dt.timezone.utc),
+                "FAILURE",
+                str(err),
+            )
+        except Exception:
+            logger.exception(
+                "Unable to record failure task for job %s",
+                msg.msg_id,
+            )
+    finally:
+        try:
+            if reschedule:
+                # the next round is enqueued atomically with the ack, so the
+                # healthcheck chain neither stops nor forks
+                repo.ack_and_enqueue_message(
+                    msg.msg_id,
+                    CommandType.HEALTHCHECK_CLUSTERS,
+                    HealthcheckClustersCommand(),
+                    msg.created_by,
+                    lease_owner=lease_owner,
+                    start_after_seconds=HEALTHCHECK_INTERVAL_SECONDS
+                    + random.randint(0, 10),
+                )
+            else:
+                repo.ack_message(msg.msg_id, lease_owner=lease_owner)
+        except Exception:
+            logger.exception("Unable to acknowledge MQ message %s", msg.msg_id)
+
+
+class MqConsumer:
+    """Claim MQ messages in batches and run their handlers on a bounded pool.
+
+    While claims keep returning full batches the consumer polls again right
+    away; once the queue is drained it backs off exponentially between polls
+    and is woken early by local enqueues or, when enabled, the mq changefeed.
+    Claims are short leases that a background heartbeat keeps alive, so no
+    transaction or pooled connection is held while a handler runs.
+
+    Nothing blocking runs on the event loop: handlers use the worker pool and
+    the consumer's own queue polling and heartbeats go through a dedicated
+    DB thread, so queue work cannot stall requests served by the same loop.
+
+    ``stop`` starts a graceful drain: no new messages are claimed, leases of
+    running handlers keep being extended, and ``run`` returns once handlers
+    and the playbook workers they started have finished or the drain timeout
+    expired.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = MQ_MAX_WORKERS,
+        batch_size: int = MQ_BATCH_SIZE,
+    ) -> None:
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.lease_owner = (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="mq-worker",
+            initializer=use_worker_pool,
+        )
+        self._db_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="mq-db",
+            initializer=use_worker_pool,
+        )
+        self._in_flight: dict[int, asyncio.Future] = {}
+        self._running_by_type: Counter[CommandType] = Counter()
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop claiming messages and drain in-flight work. Call from the loop."""
+        if not self._stopping.is_set():
+            logger.info("Draining MQ consumer %s", self.lease_owner)
+        self._stopping.set()
+
+    def _type_limits(self) -> dict[CommandType, int]:
+        """Remaining capacity per message type for the next claim."""
+        limits = {
+            command_type: max(0, limit - self._running_by_type[command_type])
+            for command_type, limit in COMMAND_CONCURRENCY.items()
+        }
+        return limits
+
+    def _kind_limits(self) -> dict[str, int]:
+        """Free remote worker slots per kind for the next claim.
+
+        Handlers that are running but may not have submitted their playbook
+        yet count against their kind, so a claim never leases more messages
+        than the remote worker pool can start right away.
+        """
+        dispatched: Counter[str] = Counter()
+        for command_type, kind in REMOTE_WORKER_KINDS.items():
+            dispatched[kind] += self._running_by_type[command_type]
+        return {
+            kind: max(0, remote_workers.free_slots(kind) - dispatched[kind])
+            for kind in set(REMOTE_WORKER_KINDS.values())
+        }
+
+    def _non_interactive_limit(self) -> int:
+        """Follow-up and background messages the next claim may lease."""
+        non_interactive_running = sum(
+            count
+            for command_type, count in self._running_by_type.items()
+            if command_priority(command_type) != MqPriority.INTERACTIVE
+        )
+        non_interactive_slots = max(
+            1,
+            self.max_workers - MQ_INTERACTIVE_RESERVED_SLOTS,
+        )
+        return max(0, non_interactive_slots - non_interactive_running)
+
+    async def _run_db(self, fn: Callable, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(
+            self._db_executor,
+            partial(fn, *args, **kwargs),
+        )
+
+    async def _claim(self, limit: int) -> list[Msg]:
+        try:
+            return await self._run_db(
+                get_repo().claim_messages,
+                limit,
+                lease_owner=self.lease_owner,
+                lease_seconds=MQ_LEASE_SECONDS,
+                type_limits=self._type_limits(),
+                non_interactive_limit=self._non_interactive_limit(),
+                type_kinds=REMOTE_WORKER_KINDS,
+                kind_limits=self._kind_limits(),
+            )
+        except Exception:
+            logger.exception("Unexpected failure while polling the message queue")
+            return []
+
+    def _dispatch(self, loop: asyncio.AbstractEventLoop, msg: Msg) -> None:
+        self._running_by_type[msg.msg_type] += 1
+        future = loop.run_in_executor(
+            self._executor,
+            process_message,
+            msg,
+            self.lease_owner,
+        )
+        self._in_flight[msg.msg_id] = future
+        future.add_done_callback(lambda _future: self._on_done(msg))
+
+    def _on_done(self, msg: Msg) -> None:
+        self._in_flight.pop(msg.msg_id, None)
+        self._running_by_type[msg.msg_type] -= 1
+
+    async def _heartbeat(self) -> None:
         while True:
-            await asyncio.sleep(5 * random.uniform(0.7, 1.3))
+            await asyncio.sleep(MQ_HEARTBEAT_SECONDS)
+            msg_ids = list(self._in_flight)
+            if not msg_ids:
+                continue
             try:
-                with get_pool().connection() as conn:
-                    with conn.cursor(row_factory=class_row(Msg)) as cur:
-                        with conn.transaction():
-                            msg = cur.execute("""
-                                SELECT * 
-                                FROM mq 
-                                WHERE now() > start_after 
-                                LIMIT 1 
-                                FOR UPDATE SKIP LOCKED
-                                """).fetchone()
-
-                            if msg is None:
-                                continue
-
-                            logger.info(
-                                "Processing MQ message %s of type %s",
-                                msg.msg_id,
-                                msg.msg_type,
-                            )
-                            repo = get_repo()
-
-                            try:
-                                handler = COMMAND_HANDLERS.get(msg.msg_type)
-                                if handler is None:
-                                    raise ValueError(
-                                        f"Unknown task type requested: {msg.msg_type}"
-                                    )
-
-                                command = parse_command_payload(
-                                    msg.msg_type,
-                                    msg.msg_data,
-                                )
-                                handler(msg.msg_id, command, msg.created_by)
-
-                                if msg.msg_type == CommandType.HEALTHCHECK_CLUSTERS:
-                                    cur.execute(
-                                        """
-                                        INSERT INTO mq (msg_type, start_after) 
-                                        VALUES (%s, now() + INTERVAL '60s' + (random()*10)::INTERVAL)
-                                        """,
-                                        (CommandType.HEALTHCHECK_CLUSTERS.value,),
-                                    )
-                            except Exception as err:
-                                logger.exception(
-                                    "MQ message %s failed during dispatch",
-                                    msg.msg_id,
-                                )
-                                try:
-                                    repo.update_job(msg.msg_id, JobState.FAILED)
-                                except Exception:
-                                    logger.exception(
-                                        "Unable to mark job %s as failed",
-                                        msg.msg_id,
-                                    )
-                                try:
-                                    repo.create_task(
-                                        msg.msg_id,
-                                        0,
-                                        dt.datetime.now(dt.timezone.utc),
-                                        "FAILURE",
-                                        str(err),
-                                    )
-                                except Exception:
-                                    logger.exception(
-                                        "Unable to record failure task for job %s",
-                                        msg.msg_id,
-                                    )
-                            finally:
-                                cur.execute(
-                                    "DELETE FROM mq WHERE msg_id = %s;",
-                                    (msg.msg_id,),
-                                )
+                held = await self._run_db(
+                    get_repo().extend_leases,
+                    msg_ids,
+                    lease_owner=self.lease_owner,
+                    lease_seconds=MQ_LEASE_SECONDS,
+                )
             except Exception:
-                logger.exception("Unexpected failure while polling the message queue")
+                logger.exception("Unable to extend MQ leases")
+                continue
+            # messages acked while the heartbeat ran are gone, not lost
+            lost = [
+                msg_id
+                for msg_id in msg_ids
+                if msg_id not in held and msg_id in self._in_flight
+            ]
+            if lost:
+                logger.warning("Lost MQ leases for messages %s", lost)
+
+    async def _wait(self, timeout: float, *, wake_on_enqueue: bool = True) -> bool:
+        """Sleep for ``timeout`` seconds, waking early when a handler finishes,
+        a message is enqueued or the consumer is stopped. Returns whether an
+        enqueue woke the consumer.
+        """
+        stop_task = asyncio.ensure_future(self._stopping.wait())
+        waiters: list[asyncio.Future] = [stop_task, *self._in_flight.values()]
+        wakeup_task = None
+        if wake_on_enqueue:
+            wakeup_task = asyncio.ensure_future(queue_wakeup.wait())
+            waiters.append(wakeup_task)
+
+        try:
+            await asyncio.wait(
+                waiters,
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            for task in (stop_task, wakeup_task):
+                if task is not None and not task.done():
+                    task.cancel()
+        return (
+            wakeup_task is not None
+            and wakeup_task.done()
+            and not wakeup_task.cancelled()
+        )
+
+    async def _drain(self, timeout: float) -> None:
+        deadline = asyncio.get_running_loop().time() + timeout
+
+        if self._in_flight:
+            logger.info("Waiting for %s in-flight MQ messages", len(self._in_flight))
+            _done, pending = await asyncio.wait(
+                list(self._in_flight.values()),
+                timeout=timeout,
+            )
+            if pending:
+                # their leases expire and another consumer picks them up
+                logger.warning(
+                    "Drain timed out with %s MQ messages still running",
+                    len(pending),
+                )
 
+        remaining = max(0.0, deadline - asyncio.get_running_loop().time())
+        still_running = await asyncio.to_thread(wait_for_workers, remaining)
+        if still_running:
+            logger.warning(
+                "Drain timed out with %s playbook workers still running",
+                still_running,
+            )
+
+    async def run(self) -> None:
+        use_worker_pool()
+        loop = asyncio.get_running_loop()
+        idle_delay = MQ_IDLE_MIN_SECONDS
+        queue_wakeup.bind(loop)
+        heartbeat_task = asyncio.create_task(self._heartbeat())
+        changefeed = None
+        if MQ_CHANGEFEED_WAKEUP:
+            changefeed = MqChangefeedListener(DB_URL, queue_wakeup)
+            changefeed.start()
+
+        try:
+            while not self._stopping.is_set():
+                free_slots = self.max_workers - len(self._in_flight)
+                if free_slots <= 0:
+                    # new messages cannot be taken anyway, leave the wakeup
+                    # pending until a slot frees up
+                    await self._wait(MQ_IDLE_MAX_SECONDS, wake_on_enqueue=False)
+                    continue
+
+                limit = min(free_slots, self.batch_size)
+                messages = await self._claim(limit)
+                for msg in messages:
+                    self._dispatch(loop, msg)
+
+                if len(messages) == limit:
+                    continue
+
+                if messages:
+                    idle_delay = MQ_IDLE_MIN_SECONDS
+                else:
+                    idle_delay = min(idle_delay * 2, MQ_IDLE_MAX_SECONDS)
+
+                if await self._wait(idle_delay * random.uniform(0.7, 1.3)):
+                    idle_delay = MQ_IDLE_MIN_SECONDS
+
+            await self._drain(MQ_DRAIN_TIMEOUT_SECONDS)
+        finally:
+            heartbeat_task.cancel()
+            if changefeed is not None:
+                changefeed.stop()
+            queue_wakeup.unbind()
+            self._executor.shutdown(wait=False)
+            self._db_executor.shutdown(wait=False)
+
+
+async def pull_from_mq(consumer: MqConsumer | None = None):
+    try:
+        await (consumer or MqConsumer()).run()
     except asyncio.CancelledError:
         logger.info("Task pull_from_mq was stopped")
@@ -4,16 +4,118 @@ import json
 import logging
 import os
 import shutil
+import threading
 import time
 
 import ansible_runner
 import yaml
 
-from ...infra import get_repo
-from ...models import JobState, Playbook
+from ...infra import get_repo, use_worker_pool
+from ...models import JobState, Playbook, Task
 
 logger = logging.getLogger(__name__)
 
+TASK_FLUSH_EVENTS = 200
+TASK_FLUSH_INTERVAL_SECONDS = 0.5
+TASK_WRITE_ATTEMPTS = 3
+TASK_WRITE_RETRY_SECONDS = 1.0
+
+
+class TaskEventWriter:
+    """Buffer playbook task events and write them to ``tasks`` in batches.
+
+    Events are added from the ansible_runner event thread; a background
+    thread writes them as one multi-row INSERT every ``max_events`` events or
+    ``interval`` seconds, whichever comes first. ``close`` writes whatever is
+    left and must be called once the playbook finished or failed.
+    """
+
+    def __init__(
+        self,
+        repo,
+        job_id: int,
+        *,
+        max_events: int = TASK_FLUSH_EVENTS,
+        interval: float = TASK_FLUSH_INTERVAL_SECONDS,
+    ):
+        self.repo = repo
+        self.job_id = job_id
+        self.max_events = max_events
+        self.interval = interval
+        self._buffer: list[Task] = []
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"task-writer-{job_id}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def add(self, task: Task) -> None:
+        with self._cond:
+            self._buffer.append(task)
+            if len(self._buffer) >= self.max_events:
+                self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _run(self) -> None:
+        use_worker_pool()
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._buffer) >= self.max_events,
+                    timeout=self.interval,
+                )
+                batch, self._buffer = self._buffer, []
+                closed = self._closed
+
+            if batch:
+                self._write(batch)
+            if closed:
+                return
+
+    def _write(self, batch: list[Task]) -> None:
+        """Write ``batch``, retrying it and finally falling back to one INSERT
+        per event, so a single bad row or a short outage does not drop the
+        whole batch. Events already written by an attempt that reported an
+        error are skipped, not counted as dropped.
+        """
+        for attempt_no in range(1, TASK_WRITE_ATTEMPTS + 1):
+            try:
+                self.repo.create_tasks(batch)
+                return
+            except Exception:
+                logger.warning(
+                    "Unable to write %s task events for job %s (attempt %s/%s)",
+                    len(batch),
+                    self.job_id,
+                    attempt_no,
+                    TASK_WRITE_ATTEMPTS,
+                    exc_info=True,
+                )
+            if attempt_no < TASK_WRITE_ATTEMPTS:
+                time.sleep(TASK_WRITE_RETRY_SECONDS * attempt_no)
+
+        dropped = 0
+        for task in batch:
+            try:
+                self.repo.create_tasks([task])
+            except Exception:
+                dropped += 1
+        if dropped:
+            logger.error(
+                "Dropped %s of %s task events for job %s",
+                dropped,
+                len(batch),
+                self.job_id,
+            )
+
 
 class MyRunner:
     def __init__(
@@ -25,6 +127,7 @@ class MyRunner:
         self.job_id = job_id
         self.counter = counter
         self.repo = get_repo()
+        self.task_writer: TaskEventWriter | None = None
 
     def my_status_handler(self, status, runner_config):
         return
@@ -83,13 +186,17 @@ class MyRunner:
             task_type = e["event"]
             task_data = json.dumps(e)
 
-        self.repo.create_task(
-            self.job_id,
-            self.counter,
-            e["created"],
-            task_type,
-            task_data,
+        task = Task(
+            job_id=self.job_id,
+            task_id=self.counter,
+            created_at=e["created"],
+            task_name=task_type,
+            task_desc=task_data,
         )
+        if self.task_writer is not None:
+            self.task_writer.add(task)
+        else:
+            self.repo.create_tasks([task])
 
         self.counter += 1
 
@@ -108,6 +215,7 @@ class MyRunner:
             os.makedirs(job_dir, exist_ok=True)
             self.repo.update_job(self.job_id, JobState.RUNNING)
 
+            self.task_writer = TaskEventWriter(self.repo, self.job_id)
             thread, runner = ansible_runner.run_async(
                 quiet=False,
                 verbosity=1,
@@ -118,6 +226,7 @@ class MyRunner:
                 status_handler=self.my_status_handler,
             )
         except Exception as err:
+            self._close_task_writer()
             self.repo.update_job(self.job_id, JobState.FAILED)
             self.repo.create_task(
                 self.job_id,
@@ -143,11 +252,14 @@ class MyRunner:
 
                 time.sleep(1)
 
+            # persist every task event before the job turns terminal
+            self._close_task_writer()
             if runner.status == "successful":
                 self.repo.update_job(self.job_id, JobState.COMPLETED)
             else:
                 self.repo.update_job(self.job_id, JobState.FAILED)
         except Exception:
+            self._close_task_writer()
             self.repo.update_job(self.job_id, JobState.FAILED)
             logger.exception(
                 "Error while monitoring playbook '%s' for job %s",
@@ -156,10 +268,16 @@ class MyRunner:
             )
             return "failed", self.data, self.counter
         finally:
+            self._close_task_writer()
             shutil.rmtree(job_dir, ignore_errors=True)
 
         return runner.status, self.data, self.counter
 
+    def _close_task_writer(self) -> None:
+        if self.task_writer is not None:
+            self.task_writer.close()
+            self.task_writer = None
+
 
 class MyRunnerLite:
     def __init__(
@@ -1,5 +1,145 @@
 """Shared helpers for cluster workers."""
 
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from ...infra import use_worker_pool
+
+logger = logging.getLogger(__name__)
+
+REMOTE_MAX_WORKERS = int(os.getenv("REMOTE_MAX_WORKERS", "16"))
+
+# Upper bound of concurrently running playbooks per worker kind. Additional
+# runs wait in memory until a slot of their kind frees up.
+REMOTE_KIND_LIMITS: dict[str, int] = {
+    "create": 4,
+    "delete": 4,
+    "scale": 4,
+    "upgrade": 4,
+    "healthcheck": 8,
+}
+REMOTE_DEFAULT_KIND_LIMIT = 4
+
+
+class RemoteWorkerPool:
+    """Shared, bounded executor for Ansible-backed workers.
+
+    Playbook runs are grouped by kind; each kind may occupy at most its limit
+    of the pool's threads, so a healthcheck round over every cluster cannot
+    crowd out cluster operations or spawn one ansible process per cluster.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = REMOTE_MAX_WORKERS,
+        kind_limits: dict[str, int] | None = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.kind_limits = dict(
+            REMOTE_KIND_LIMITS if kind_limits is None else kind_limits
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="remote-worker",
+            initializer=use_worker_pool,
+        )
+        self._cond = threading.Condition()
+        # runs handed to the executor, per kind
+        self._submitted: Counter[str] = Counter()
+        # runs currently executing on a pool thread
+        self._active = 0
+        self._pending: dict[str, deque[tuple[Callable[..., Any], tuple]]] = {}
+
+    def limit(self, kind: str) -> int:
+        return self.kind_limits.get(kind, REMOTE_DEFAULT_KIND_LIMIT)
+
+    def submit(self, kind: str, target: Callable[..., Any], args: tuple = ()) -> None:
+        with self._cond:
+            if self._submitted[kind] < self.limit(kind):
+                self._submitted[kind] += 1
+                self._executor.submit(self._run, kind, target, args)
+            else:
+                self._pending.setdefault(kind, deque()).append((target, args))
+
+    def _run(self, kind: str, target: Callable[..., Any], args: tuple) -> None:
+        with self._cond:
+            self._active += 1
+        try:
+            target(*args)
+        except Exception:
+            logger.exception("Unhandled error in %s worker %s", kind, target.__name__)
+        finally:
+            with self._cond:
+                self._active -= 1
+                pending = self._pending.get(kind)
+                if pending:
+                    next_target, next_args = pending.popleft()
+                    self._executor.submit(self._run, kind, next_target, next_args)
+                else:
+                    self._submitted[kind] -= 1
+                self._cond.notify_all()
+
+    def free_slots(self, kind: str) -> int:
+        """Runs of ``kind`` that would start right away instead of queueing."""
+        with self._cond:
+            queued = len(self._pending.get(kind, ()))
+            return max(0, self.limit(kind) - self._submitted[kind] - queued)
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            queued_by_kind = {
+                kind: len(pending) for kind, pending in self._pending.items() if pending
+            }
+            submitted = sum(self._submitted.values())
+            return {
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "running_by_kind": {
+                    kind: count for kind, count in self._submitted.items() if count
+                },
+                "queued_by_kind": queued_by_kind,
+                # runs waiting for their kind's limit or for a pool thread
+                "queue_depth": sum(queued_by_kind.values()) + submitted - self._active,
+            }
+
+    def wait(self, timeout: float) -> int:
+        """Wait up to ``timeout`` seconds for all runs to finish.
+
+        Returns the number of runs still running or queued afterwards.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                outstanding = sum(self._submitted.values()) + sum(
+                    len(pending) for pending in self._pending.values()
+                )
+                remaining = deadline - time.monotonic()
+                if not outstanding or remaining <= 0:
+                    return outstanding
+                self._cond.wait(remaining)
+
+
+remote_workers = RemoteWorkerPool()
+
+
+def start_worker(
+    kind: str,
+    target: Callable[..., Any],
+    args: tuple = (),
+) -> None:
+    """Run a playbook worker on the shared remote worker pool."""
+    remote_workers.submit(kind, target, args)
+
+
+def wait_for_workers(timeout: float) -> int:
+    """Wait for queued and running playbook workers; see ``RemoteWorkerPool.wait``."""
+    return remote_workers.wait(timeout)
+
 
 def get_node_count_per_zone(zone_count: int, node_count: int) -> list[int]:
     """Distribute nodes across zones as evenly as possible."""
@@ -1,7 +1,6 @@
 import datetime as dt
 import logging
 import secrets
-from threading import Thread
 
 from ...infra import get_repo
 from ...infra.util import encrypt_secret
@@ -18,7 +17,7 @@ from ...models import (
 )
 from ...services.storage_broker import StorageBrokerService
 from .ansible import MyRunner
-from .common import get_node_count_per_zone
+from .common import get_node_count_per_zone, start_worker
 
 logger = logging.getLogger(__name__)
 
@@ -69,7 +68,8 @@ def create_cluster(
         JobState.QUEUED,
     )
 
-    Thread(
+    start_worker(
+        "create",
         target=create_cluster_worker,
         args=(
             job_id,
@@ -77,7 +77,7 @@ def create_cluster(
             created_by,
             cluster_db_password,
         ),
-    ).start()
+    )
 
 
 def create_cluster_worker(
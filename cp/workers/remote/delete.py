@@ -1,10 +1,10 @@
 import datetime as dt
 import logging
-from threading import Thread
 
 from ...infra import get_repo
 from ...models import ClusterState, DeleteClusterCommand, JobState, PlaybookName
 from .ansible import MyRunner
+from .common import start_worker
 
 logger = logging.getLogger(__name__)
 
@@ -58,14 +58,15 @@ def delete_cluster(
         status=ClusterState.DELETING,
     )
 
-    Thread(
+    start_worker(
+        "delete",
         target=delete_cluster_worker,
         args=(
             job_id,
             cluster_id,
             requested_by,
         ),
-    ).start()
+    )
 
 
 def delete_cluster_worker(
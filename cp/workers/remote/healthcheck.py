@@ -1,9 +1,30 @@
+import asyncio
+import logging
 import os
-from threading import Thread
+
+import psycopg
 
 from ...infra import get_repo
-from ...models import ClusterState, HealthcheckClustersCommand, PlaybookName
+from ...infra.util import CONNECT_TIMEOUT_SECS, cluster_db_conninfo
+from ...models import Cluster, ClusterState, HealthcheckClustersCommand, PlaybookName
+from ...services.cluster_db import get_cluster_db_password, get_primary_dns_address
 from .ansible import MyRunnerLite
+from .common import start_worker
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of cluster SQL connections open at once during a round.
+HEALTH_PROBE_CONCURRENCY = int(os.getenv("HEALTH_PROBE_CONCURRENCY", "32"))
+HEALTH_PROBE_TIMEOUT_SECONDS = 10
+# SSH key used by the fallback playbook, as provisioned by create_cluster.
+HEALTHCHECK_SSH_KEY_NAME = "workshop"
+
+NODE_LIVENESS_STMT = """
+    SELECT n.node_id, n.is_live
+    FROM crdb_internal.gossip_nodes AS n
+    JOIN crdb_internal.gossip_liveness AS l ON l.node_id = n.node_id
+    WHERE l.membership = 'active'
+    """
 
 
 def healthcheck_clusters(
@@ -14,28 +35,97 @@ def healthcheck_clusters(
     repo = get_repo()
     active_clusters = repo.list_active_clusters()
 
-    for cluster in active_clusters:
-        ssh_key_name = cluster.description["ssh_key"]
+    results = asyncio.run(probe_clusters(active_clusters))
 
-        if not os.path.exists(f"/tmp/{ssh_key_name}"):
-            ssh_key = repo.get_secret(ssh_key_name)
+    for cluster, is_healthy in zip(active_clusters, results):
+        if is_healthy is None:
+            # SQL endpoint unreachable, ask the nodes themselves over SSH
+            try:
+                ssh_key = _ssh_key_path(HEALTHCHECK_SSH_KEY_NAME)
+            except Exception:
+                logger.exception(
+                    "Unable to prepare fallback healthcheck for cluster '%s'",
+                    cluster.cluster_id,
+                )
+                continue
 
-            with open(f"/tmp/{ssh_key_name}", "w") as f:
-                f.write(ssh_key)
+            start_worker(
+                "healthcheck",
+                target=healthcheck_clusters_worker,
+                args=(
+                    job_id,
+                    cluster.cluster_id,
+                    [
+                        node
+                        for region in cluster.cluster_inventory
+                        for node in region.nodes
+                    ],
+                    ssh_key,
+                ),
+            )
+        elif not is_healthy:
+            repo.update_cluster(
+                cluster.cluster_id,
+                "system",
+                status=ClusterState.UNHEALTHY,
+            )
 
-        cockroachdb_nodes = []
-        for region in cluster.description["cluster"]:
-            cockroachdb_nodes += region["nodes"]
 
-        Thread(
-            target=healthcheck_clusters_worker,
-            args=(
-                job_id,
-                cluster.cluster_id,
-                cockroachdb_nodes,
-                f"/tmp/{ssh_key_name}",
-            ),
-        ).start()
+async def probe_clusters(clusters: list[Cluster]) -> list[bool | None]:
+    """Probe node liveness of every cluster through its SQL load balancer.
+
+    Returns, per cluster, whether all active nodes are live, or ``None`` when
+    the cluster could not be queried.
+    """
+    semaphore = asyncio.Semaphore(HEALTH_PROBE_CONCURRENCY)
+    return await asyncio.gather(
+        *(probe_cluster(cluster, semaphore) for cluster in clusters)
+    )
+
+
+async def probe_cluster(cluster: Cluster, semaphore: asyncio.Semaphore) -> bool | None:
+    try:
+        conninfo = cluster_db_conninfo(
+            get_primary_dns_address(cluster),
+            get_cluster_db_password(cluster),
+        )
+    except Exception:
+        logger.warning("Cluster '%s' has no SQL endpoint to probe", cluster.cluster_id)
+        return None
+
+    async with semaphore:
+        try:
+            rows = await asyncio.wait_for(
+                _fetch_node_liveness(conninfo),
+                timeout=HEALTH_PROBE_TIMEOUT_SECONDS,
+            )
+        except Exception as err:
+            logger.info(
+                "Health probe of cluster '%s' failed: %s", cluster.cluster_id, err
+            )
+            return None
+
+    return bool(rows) and all(is_live for _node_id, is_live in rows)
+
+
+async def _fetch_node_liveness(conninfo: str) -> list[tuple]:
+    async with await psycopg.AsyncConnection.connect(
+        conninfo,
+        autocommit=True,
+        connect_timeout=CONNECT_TIMEOUT_SECS,
+    ) as conn:
+        cur = await conn.execute(NODE_LIVENESS_STMT)
+        return await cur.fetchall()
+
+
+def _ssh_key_path(ssh_key_name: str) -> str:
+    path = f"/tmp/{ssh_key_name}"
+    if not os.path.exists(path):
+        ssh_key = get_repo().get_secret(ssh_key_name)
+
+        with open(path, "w") as f:
+            f.write(ssh_key)
+    return path
 
 
 def healthcheck_clusters_worker(
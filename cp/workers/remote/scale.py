@@ -1,6 +1,5 @@
 import datetime as dt
 import logging
-from threading import Thread
 
 from ...infra import get_repo
 from ...models import (
@@ -14,7 +13,7 @@ from ...models import (
     Region,
 )
 from .ansible import MyRunner
-from .common import get_node_count_per_zone
+from .common import get_node_count_per_zone, start_worker
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +40,8 @@ def scale_cluster(
         JobState.QUEUED,
     )
 
-    Thread(
+    start_worker(
+        "scale",
         target=scale_cluster_worker_entry,
         args=(
             job_id,
@@ -49,7 +49,7 @@ def scale_cluster(
             current_cluster,
             requested_by,
         ),
-    ).start()
+    )
 
 
 def scale_cluster_worker_entry(
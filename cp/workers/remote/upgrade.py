@@ -1,10 +1,10 @@
 import datetime as dt
 import logging
-from threading import Thread
 
 from ...infra import get_repo
 from ...models import ClusterState, ClusterUpgradeRequest, JobState, PlaybookName
 from .ansible import MyRunner
+from .common import start_worker
 
 logger = logging.getLogger(__name__)
 
@@ -57,14 +57,15 @@ def upgrade_cluster(
         status=ClusterState.UPGRADING,
     )
 
-    Thread(
+    start_worker(
+        "upgrade",
         target=upgrade_cluster_worker,
         args=(
             job_id,
             cur,
             requested_by,
         ),
-    ).start()
+    )
 
 
 def upgrade_cluster_worker(
@@ -6,7 +6,12 @@ CREATE TABLE public.mq (
     msg_data JSONB NOT NULL DEFAULT '{}':::JSONB,
     created_at TIMESTAMPTZ NOT NULL DEFAULT now():::TIMESTAMPTZ,
     created_by STRING NOT NULL DEFAULT 'system':::STRING,
-    CONSTRAINT pk PRIMARY KEY (msg_id ASC)
+    priority INT2 NOT NULL DEFAULT 2,
+    leased_until TIMESTAMPTZ NULL,
+    lease_owner STRING NULL,
+    attempts INT2 NOT NULL DEFAULT 0,
+    CONSTRAINT pk PRIMARY KEY (msg_id ASC),
+    INDEX idx_mq_priority_start_after (priority ASC, start_after ASC)
 );
 CREATE TABLE public.clusters (
     cluster_id STRING NOT NULL,
@@ -246,6 +251,11 @@ CREATE TABLE public.oidc_sessions (
     updated_at TIMESTAMPTZ NOT NULL DEFAULT now():::TIMESTAMPTZ ON UPDATE now():::TIMESTAMPTZ,
     CONSTRAINT pk_oidc_sessions PRIMARY KEY (session_id ASC)
 ) WITH (ttl = 'on', ttl_expiration_expression = e'(session_expires_at)', ttl_job_cron = '@hourly');
+CREATE TABLE public.api_key_nonces (
+    nonce BYTES NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL,
+    CONSTRAINT pk_api_key_nonces PRIMARY KEY (nonce ASC)
+) WITH (ttl = 'on', ttl_expiration_expression = e'(expires_at)', ttl_job_cron = '@hourly');
 
 ALTER TABLE public.map_clusters_jobs ADD CONSTRAINT cluster_id_in_clusters FOREIGN KEY (cluster_id) REFERENCES public.clusters(cluster_id) ON DELETE CASCADE;
 ALTER TABLE public.map_clusters_jobs ADD CONSTRAINT job_id_in_jobs FOREIGN KEY (job_id) REFERENCES public.jobs(job_id) ON DELETE CASCADE;
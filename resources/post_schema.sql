@@ -13,6 +13,7 @@ INSERT INTO public.settings (
     description
 ) VALUES
     ('auth.api_key_signature_ttl_seconds', '300', 'integer', 'auth', false, 'Maximum allowed age for signed API key requests in seconds.'),
+    ('auth.api_key_replay_shared', 'false', 'boolean', 'auth', false, 'Share API key replay protection across replicas through the api_key_nonces table.'),
     ('logging.journald_identifier', 'cp', 'string', 'logging', false, 'Journald identifier used by the control plane logger.'),
     ('logging.level', 'INFO', 'string', 'logging', false, 'Application log verbosity level.'),
     ('storage.s3.url', '', 'url', 'storage', false, 'Base S3 endpoint used for tenant external connections.'),